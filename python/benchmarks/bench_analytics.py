@@ -0,0 +1,50 @@
+"""Time the receipt_analytics group-bys over a generated archive.
+
+Run from the python directory; the archive is built once and reused:
+
+    python -m benchmarks.bench_analytics [baskets] [lines_per_basket]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import receipt_analytics
+from receipt_archive import ReceiptArchive, ReceiptArchiveWriter
+from workload import build_workload
+
+QUERIES = [
+    ("sales_by_product", receipt_analytics.sales_by_product),
+    ("discounts_by_product", receipt_analytics.discounts_by_product),
+    ("discounts_by_offer_type", receipt_analytics.discounts_by_offer_type),
+    ("discounts_by_hour", receipt_analytics.discounts_by_hour),
+]
+
+
+def main(args):
+    baskets = int(args[0]) if args else 50_000
+    lines = int(args[1]) if len(args) > 1 else 20
+    workload = build_workload(skus=100_000, baskets=baskets, lines=lines)
+    engines = [False, True] if receipt_analytics.HAVE_NUMPY else [False]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "day.receipts")
+        with ReceiptArchiveWriter(path) as writer:
+            for n, receipt in enumerate(workload.teller.checkout_many(workload.carts)):
+                writer.write(receipt, timestamp=1_700_000_000.0 + n)
+
+        with ReceiptArchive(path) as archive:
+            item_lines = sum(len(c.items) for c in workload.carts)
+            print(f"{len(archive)} receipts, {item_lines} item lines")
+            for name, query in QUERIES:
+                for use_numpy in engines:
+                    start = time.perf_counter()
+                    query(archive, use_numpy=use_numpy)
+                    seconds = time.perf_counter() - start
+                    engine = "numpy" if use_numpy else "python"
+                    print(f"  {name:<24} {engine:<7} {seconds:7.3f}s  "
+                          f"({item_lines / seconds / 1e6:5.1f}M lines/s)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
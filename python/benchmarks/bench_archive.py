@@ -0,0 +1,59 @@
+"""Compare the receipt archive with pickle and printed text.
+
+Run from the python directory:
+
+    python -m benchmarks.bench_archive [baskets]
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from receipt_archive import ReceiptArchive, ReceiptArchiveWriter
+from receipt_printer import ReceiptPrinter
+from workload import build_workload
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"  {label:<24} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main(args):
+    baskets = int(args[0]) if args else 100_000
+    workload = build_workload(baskets=baskets)
+    receipts = workload.teller.checkout_many(workload.carts)
+    lines = sum(len(r.item_view) + len(r.discount_view) for r in receipts)
+    print(f"{baskets} receipts, {lines} lines")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "day.receipts")
+
+        def write_archive():
+            with ReceiptArchiveWriter(path) as writer:
+                for receipt in receipts:
+                    writer.write(receipt)
+
+        timed("archive write", write_archive)
+        with ReceiptArchive(path) as archive:
+            totals = timed("archive scan_totals", archive.scan_totals)
+            restored = timed("archive read receipts", lambda: list(archive))
+        assert [r.total_price() for r in receipts] == list(totals)
+        assert len(restored) == len(receipts)
+        archive_size = os.path.getsize(path)
+
+    pickled = timed("pickle dumps", lambda: pickle.dumps(receipts, protocol=pickle.HIGHEST_PROTOCOL))
+    timed("pickle loads", lambda: pickle.loads(pickled))
+    printer = ReceiptPrinter()
+    text = timed("print receipts", lambda: "".join(printer.print_receipt(r) for r in receipts))
+
+    print(f"  archive: {archive_size / lines:6.1f} B/line")
+    print(f"  pickle:  {len(pickled) / lines:6.1f} B/line")
+    print(f"  text:    {len(text.encode()) / lines:6.1f} B/line")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
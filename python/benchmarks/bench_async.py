@@ -0,0 +1,63 @@
+"""Compare async checkout against pushing synchronous checkouts into threads.
+
+Both sides talk to a catalog with the same simulated latency and the
+same number of connections. Run from the python directory:
+
+    python -m benchmarks.bench_async [carts] [latency_ms] [connections]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_checkout import build
+from teller import Teller
+from tests.fake_async_catalog import FakeAsyncCatalog
+from tests.fake_catalog import FakeCatalog
+
+
+class SleepingCatalog(FakeCatalog):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def unit_prices(self, products):
+        time.sleep(self.latency)
+        return {p: self.prices[p.name] for p in products}
+
+
+def clone_teller(teller, catalog):
+    for name, price in teller.catalog.prices.items():
+        catalog.add_product(teller.catalog.products[name], price)
+    clone = Teller(catalog)
+    for offer in teller.offers.values():
+        clone.add_special_offer(offer.offer_type, offer.product, offer.argument)
+    return clone
+
+
+def main(args):
+    cart_count = int(args[0]) if args else 2_000
+    latency = (float(args[1]) if len(args) > 1 else 5.0) / 1000
+    connections = int(args[2]) if len(args) > 2 else 50
+    teller, carts = build(cart_count)
+    print(f"{cart_count} carts, {latency * 1000:.1f}ms per query, {connections} connections")
+
+    threaded = clone_teller(teller, SleepingCatalog(latency))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        expected = [r.total_price() for r in pool.map(threaded.checks_out_articles_from, carts)]
+    print(f"  threads: {time.perf_counter() - start:8.3f}s")
+
+    asynchronous = clone_teller(teller, FakeAsyncCatalog(latency, pool_size=connections))
+
+    async def check_out_all():
+        return await asyncio.gather(*(asynchronous.checkout_async(c) for c in carts))
+
+    start = time.perf_counter()
+    receipts = asyncio.run(check_out_all())
+    print(f"  asyncio: {time.perf_counter() - start:8.3f}s")
+    assert expected == [r.total_price() for r in receipts]
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,45 @@
+"""Measure memory held per receipt line after checkout.
+
+Carts are built the way CSV or database loaders build them: a fresh
+Product(name, unit) for every row. Run from the python directory:
+
+    python -m benchmarks.bench_memory [carts]
+"""
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.bench_checkout import build
+from model_objects import Product
+from shopping_cart import ShoppingCart
+
+
+def main(args):
+    cart_count = int(args[0]) if args else 20_000
+    teller, template_carts = build(cart_count)
+    rows = [
+        [(pq.product.name, pq.product.unit, pq.quantity) for pq in cart.items]
+        for cart in template_carts
+    ]
+    del template_carts
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    receipts = []
+    for cart_rows in rows:
+        cart = ShoppingCart()
+        for name, unit, quantity in cart_rows:
+            cart.add_item_quantity(Product(name, unit), quantity)
+        receipts.append(teller.checks_out_articles_from(cart))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    lines = sum(len(r.items) + len(r.discounts) for r in receipts)
+    print(f"{cart_count} receipts, {lines} lines")
+    print(f"  {used / lines:8.1f} bytes per receipt line")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,38 @@
+"""Compare float checkout against exact MoneyTeller checkout.
+
+Money is not free: every line total is a new int subclass rather than
+one float multiply, and on CPython a money checkout runs about a
+quarter slower than a float one. The offer pass itself is on par.
+
+Run from the python directory:
+
+    python -m benchmarks.bench_money [carts]
+"""
+import sys
+import timeit
+
+from benchmarks.bench_checkout import build
+from money import MoneyTeller
+
+
+def main(args):
+    cart_count = int(args[0]) if args else 20_000
+    teller, carts = build(cart_count)
+    teller.catalog.call_cost = 0
+    money_teller = MoneyTeller(teller.catalog)
+    money_teller.replace_offers(teller.offers.values())
+
+    # Alternate the two tellers so drift on a busy machine hits both alike.
+    best = {"float": float("inf"), "money": float("inf")}
+    for _ in range(7):
+        for name, run in (("float", teller), ("money", money_teller)):
+            seconds = timeit.timeit(lambda: run.checkout_many(carts), number=1)
+            best[name] = min(best[name], seconds)
+
+    print(f"{cart_count} carts")
+    for name, seconds in best.items():
+        print(f"  {name:6s} {seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,40 @@
+"""Per-offered-line cost of applying offers with and without compiled plans.
+
+"per basket" re-resolves each offer's config and description on every
+call, as OfferHandler.apply_offers does; "compiled" uses the OfferPlans
+built by Teller.add_special_offer. Run from the python directory:
+
+    python -m benchmarks.bench_offer_plan [carts]
+"""
+import sys
+import timeit
+
+from benchmarks.bench_checkout import build
+from receipt import Receipt
+
+
+def main(args):
+    cart_count = int(args[0]) if args else 20_000
+    teller, carts = build(cart_count)
+    handler = teller.offer_handler
+    products = {p for cart in carts for p in cart.product_quantities}
+    unit_prices = {p: teller.catalog.prices[p.name] for p in products}
+    offered_lines = sum(
+        1 for cart in carts for p in cart.product_quantities if p in teller.offers)
+
+    def per_basket():
+        for cart in carts:
+            handler.apply_offers(cart, teller.offers, teller.catalog, Receipt(), unit_prices)
+
+    def compiled():
+        for cart in carts:
+            handler.apply_offer_plans(cart, teller.offer_plans, unit_prices, Receipt())
+
+    print(f"{cart_count} carts, {offered_lines} offered lines")
+    for name, run in (("per basket", per_basket), ("compiled", compiled)):
+        seconds = min(timeit.repeat(run, number=1, repeat=5))
+        print(f"  {name:10s} {seconds * 1e9 / offered_lines:8.0f} ns per offered line")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,36 @@
+"""Compare serial Teller.checkout_many against ParallelCheckout.
+
+Run from the python directory:
+
+    python -m benchmarks.bench_parallel [carts] [workers...]
+"""
+import sys
+import time
+
+from benchmarks.bench_checkout import build
+from parallel_checkout import ParallelCheckout
+
+
+def main(args):
+    cart_count = int(args[0]) if args else 200_000
+    worker_counts = [int(a) for a in args[1:]] or [1, 2, 4]
+    teller, carts = build(cart_count)
+
+    start = time.perf_counter()
+    serial = teller.checkout_many(carts)
+    serial_seconds = time.perf_counter() - start
+    print(f"{cart_count} carts")
+    print(f"  serial:      {serial_seconds:8.3f}s")
+
+    expected = [r.total_price() for r in serial]
+    for workers in worker_counts:
+        engine = ParallelCheckout(teller, max_workers=workers, chunksize=2048)
+        start = time.perf_counter()
+        receipts = engine.checkout_many(carts)
+        seconds = time.perf_counter() - start
+        assert expected == [r.total_price() for r in receipts]
+        print(f"  {workers:2d} workers: {seconds:8.3f}s  ({serial_seconds / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
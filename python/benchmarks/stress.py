@@ -0,0 +1,137 @@
+"""Hammer one shared Teller from many threads and check every receipt.
+
+Each thread checks out every cart of a seeded workload in its own order,
+while the main thread keeps swapping the offers table between two
+versions. Every receipt must equal the serial receipt for the offers
+version it records. Threads also add to and void items from one shared
+cart, and the final cart must hold exactly the quantities that were
+scanned. Run from the python directory:
+
+    python -m benchmarks.stress --threads 8 --baskets 2000
+
+The process exits with status 1 when any check fails.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import NamedTuple
+
+from caching_catalog import CachingCatalog
+from shopping_cart import ShoppingCart
+from workload import build_workload, receipt_rows
+
+
+class StressReport(NamedTuple):
+    checkouts: int
+    mismatches: int
+    swaps: int
+    cart_errors: int
+    seconds: float
+
+
+def run_stress(
+    threads: int = 8,
+    baskets: int = 2_000,
+    lines: int = 10,
+    skus: int = 1_000,
+    seed: int = 1,
+    scans_per_thread: int = 2_000
+) -> StressReport:
+    workload = build_workload(seed=seed, skus=skus, baskets=baskets, lines=lines)
+    teller, carts = workload.teller, workload.carts
+    # A cache smaller than the catalog keeps evicting, so its lock is busy.
+    teller.catalog = CachingCatalog(workload.catalog, maxsize=max(1, skus // 4), ttl=None)
+
+    # Two tables, published alternately, so a version's parity names its table.
+    full = list(teller.offer_plans.table.offers.values())
+    half = full[::2]
+    expected = {}
+    for offers in (full, half):
+        version = teller.replace_offers(offers)
+        expected[version % 2] = [receipt_rows(r) for r in teller.checkout_many(carts)]
+    tables = [full, half]
+
+    shared_cart = ShoppingCart()
+    products = [workload.catalog.product(i) for i in range(min(skus, 50))]
+    mismatches = [0] * threads
+    cart_errors = [0] * threads
+    swaps = 0
+    start = threading.Barrier(threads + 1)
+
+    def check_out(worker):
+        rng = random.Random(seed + worker)
+        order = list(range(len(carts)))
+        rng.shuffle(order)
+        start.wait()
+        for index in order:
+            receipt = teller.checks_out_articles_from(carts[index])
+            if receipt_rows(receipt) != expected[receipt.offers_version % 2][index]:
+                mismatches[worker] += 1
+        for n in range(scans_per_thread):
+            product = products[(worker + n) % len(products)]
+            shared_cart.add_item_quantity(product, 2)
+            try:
+                shared_cart.remove_item_quantity(product, 1)
+            except ValueError:
+                cart_errors[worker] += 1
+
+    workers = [threading.Thread(target=check_out, args=(w,)) for w in range(threads)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for worker in workers:
+            worker.start()
+        start.wait()
+        began = time.perf_counter()
+        while any(worker.is_alive() for worker in workers):
+            teller.replace_offers(tables[swaps % 2])
+            swaps += 1
+            time.sleep(0.0005)
+        seconds = time.perf_counter() - began
+    finally:
+        sys.setswitchinterval(switch_interval)
+        for worker in workers:
+            worker.join()
+
+    scanned = {}
+    for worker in range(threads):
+        for n in range(scans_per_thread):
+            product = products[(worker + n) % len(products)]
+            scanned[product] = scanned.get(product, 0) + 1
+    if shared_cart.product_quantities != scanned:
+        cart_errors[0] += 1
+    if len(shared_cart.items) != 2 * threads * scans_per_thread:
+        cart_errors[0] += 1
+
+    return StressReport(
+        checkouts=threads * len(carts),
+        mismatches=sum(mismatches),
+        swaps=swaps,
+        cart_errors=sum(cart_errors),
+        seconds=seconds
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--baskets", type=int, default=2_000)
+    parser.add_argument("--lines", type=int, default=10)
+    parser.add_argument("--skus", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scans", type=int, default=2_000)
+    args = parser.parse_args(argv)
+
+    report = run_stress(args.threads, args.baskets, args.lines, args.skus,
+                        args.seed, args.scans)
+    print(f"{args.threads} threads, {report.checkouts} checkouts, "
+          f"{report.swaps} offer swaps in {report.seconds:.2f}s")
+    print(f"  receipt mismatches: {report.mismatches}")
+    print(f"  shared cart errors: {report.cart_errors}")
+    return 1 if report.mismatches or report.cart_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
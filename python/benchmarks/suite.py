@@ -0,0 +1,189 @@
+"""Reproducible benchmark suite for checkout, offers and printing.
+
+Builds a seeded synthetic workload, times each benchmark (best of
+--repeat runs), measures memory with tracemalloc and optionally compares
+the results with a stored baseline. Run from the python directory:
+
+    python -m benchmarks.suite --scale small
+    python -m benchmarks.suite --skus 10000000 --baskets 20 --lines 10000
+    python -m benchmarks.suite --scale small --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --scale small --save-baseline benchmarks/baseline.json
+
+The process exits with status 1 when a benchmark is slower than the
+baseline by more than --tolerance.
+"""
+import argparse
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+from typing import Callable
+
+from discount_memo import DiscountMemo
+from receipt_printer import ReceiptPrinter
+from teller import Teller
+from workload import Workload, build_workload
+
+SCALES = {
+    "tiny": dict(skus=1_000, baskets=50, lines=5),
+    "small": dict(skus=1_000, baskets=10_000, lines=10),
+    "medium": dict(skus=100_000, baskets=2_000, lines=100),
+    "large": dict(skus=10_000_000, baskets=20, lines=10_000),
+}
+
+# name -> function(workload) returning the callable to time
+BENCHMARKS: dict[str, Callable[[Workload], Callable[[], object]]] = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("checkout")
+def checkout(workload):
+    teller, carts = workload.teller, workload.carts
+    return lambda: [teller.checks_out_articles_from(cart) for cart in carts]
+
+
+@benchmark("checkout_many")
+def checkout_many(workload):
+    return lambda: workload.teller.checkout_many(workload.carts)
+
+
+@benchmark("checkout_lazy")
+def checkout_lazy(workload):
+    # A basket preview that reads the items but never the discounts.
+    return lambda: workload.teller.checkout_many(workload.carts, lazy=True)
+
+
+@benchmark("checkout_memo")
+def checkout_memo(workload):
+    # Replays the baskets through a teller that remembers discounts; the
+    # first of the repeats fills the memo.
+    teller = Teller(workload.catalog, discount_memo=DiscountMemo())
+    teller.replace_offers(workload.teller.offer_plans.table.offers.values())
+    return lambda: teller.checkout_many(workload.carts)
+
+
+@benchmark("apply_offers")
+def apply_offers(workload):
+    teller, carts = workload.teller, workload.carts
+    products = {p for cart in carts for p in cart.product_quantities}
+    unit_prices = teller.catalog.unit_prices(products)
+    receipts = [teller.price_items(cart, unit_prices) for cart in carts]
+
+    def run():
+        for cart, receipt in zip(carts, receipts):
+            teller.offer_handler.apply_offer_index(cart, teller.offer_plans, unit_prices, receipt)
+    return run
+
+
+@benchmark("print_receipt")
+def print_receipt(workload):
+    receipts = workload.teller.checkout_many(workload.carts)
+    printer = ReceiptPrinter()
+    return lambda: [printer.print_receipt(receipt) for receipt in receipts]
+
+
+def run_suite(params, repeat=5, names=None):
+    workload = build_workload(**params)
+    lines = sum(len(cart.items) for cart in workload.carts)
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        run = setup(workload)
+        seconds = min(timeit.repeat(run, number=1, repeat=repeat))
+        results[name] = {
+            "seconds": seconds,
+            "lines_per_second": lines / seconds,
+        }
+
+    gc.collect()
+    tracemalloc.start()
+    receipts = workload.teller.checkout_many(workload.carts)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del receipts
+    results["memory"] = {
+        "receipt_bytes_per_line": current / max(1, lines),
+        "peak_bytes": peak,
+    }
+    return {"params": params, "lines": lines, "results": results}
+
+
+def compare(report, baseline, tolerance):
+    """Return a message for every benchmark slower than the baseline."""
+    if baseline["params"] != report["params"]:
+        return [f"baseline was recorded with {baseline['params']}, not {report['params']}"]
+    regressions = []
+    for name, result in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or "lines_per_second" not in result:
+            continue
+        ratio = result["lines_per_second"] / previous["lines_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{name}: {result['lines_per_second']:.0f} lines/s is "
+                f"{(1 - ratio):.0%} below the baseline {previous['lines_per_second']:.0f}")
+    return regressions
+
+
+def format_report(report):
+    params = report["params"]
+    out = [f"seed={params['seed']} skus={params['skus']} baskets={params['baskets']} "
+           f"lines={params['lines']} ({report['lines']} cart lines)"]
+    for name, result in report["results"].items():
+        if "lines_per_second" in result:
+            out.append(f"  {name:16s} {result['seconds']:9.4f}s {result['lines_per_second']:12.0f} lines/s")
+    memory = report["results"]["memory"]
+    out.append(f"  {'memory':16s} {memory['receipt_bytes_per_line']:9.1f} B/line, "
+               f"peak {memory['peak_bytes'] / 2**20:.1f} MiB")
+    return "\n".join(out)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skus", type=int)
+    parser.add_argument("--baskets", type=int)
+    parser.add_argument("--lines", type=int)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", choices=BENCHMARKS,
+                        help="run only this benchmark (may be repeated)")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--baseline", help="compare with a report saved earlier")
+    parser.add_argument("--save-baseline", help="save the report as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default 0.25)")
+    options = parser.parse_args(args)
+
+    params = dict(SCALES[options.scale], seed=options.seed)
+    for key in ("skus", "baskets", "lines"):
+        if getattr(options, key) is not None:
+            params[key] = getattr(options, key)
+
+    report = run_suite(params, options.repeat, options.only)
+    print(format_report(report))
+    for path in (options.json, options.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write("\n")
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            regressions = compare(report, json.load(f), options.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
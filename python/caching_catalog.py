@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Callable, Iterable, Optional, Union
+
+from catalog import SupermarketCatalog
+from lru import LRUCache
+from model_objects import Product
+
+
+class CachingCatalog(SupermarketCatalog):
+    """Read-through price cache in front of another SupermarketCatalog.
+
+    Prices are kept in a bounded LRU keyed by product and expire
+    ``ttl`` seconds after they were fetched. ``clock`` defaults to
+    time.monotonic and can be replaced to make expiry deterministic.
+    The cache is shared safely between threads; the backing catalog is
+    called outside the lock.
+    """
+
+    def __init__(
+        self,
+        catalog: SupermarketCatalog,
+        maxsize: int = 4096,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.catalog: SupermarketCatalog = catalog
+        self.ttl: Optional[float] = ttl
+        self.clock: Callable[[], float] = clock
+        self._cache: LRUCache = LRUCache(maxsize)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.expirations: int = 0
+        self._lock = threading.Lock()
+        # Bumped by invalidate() so a fetch that raced with it is not cached.
+        self._generation: int = 0
+
+    @property
+    def evictions(self) -> int:
+        return self._cache.evictions
+
+    def add_product(self, product: Product, price: Union[int, float]) -> None:
+        self.catalog.add_product(product, price)
+        self.invalidate(product)
+
+    def invalidate(self, product: Optional[Product] = None) -> None:
+        """Forget the cached price of one product, or of every product."""
+        with self._lock:
+            self._generation += 1
+            if product is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(product)
+
+    def unit_price(self, product: Product) -> Union[int, float]:
+        return self.unit_prices([product])[product]
+
+    def unit_prices(
+        self,
+        products: Iterable[Product]
+    ) -> dict[Product, Union[int, float]]:
+        now = self.clock()
+        prices: dict[Product, Union[int, float]] = {}
+        missing: list[Product] = []
+        with self._lock:
+            generation = self._generation
+            for product in products:
+                entry = self._cache.get(product)
+                if entry is not None:
+                    price, expires_at = entry
+                    if expires_at is None or now < expires_at:
+                        prices[product] = price
+                        self.hits += 1
+                        continue
+                    self.expirations += 1
+                self.misses += 1
+                missing.append(product)
+
+        if missing:
+            fetched = self.catalog.unit_prices(missing)
+            expires_at = None if self.ttl is None else now + self.ttl
+            with self._lock:
+                if generation == self._generation:
+                    for product, price in fetched.items():
+                        self._cache.put(product, (price, expires_at))
+            prices.update(fetched)
+        return prices
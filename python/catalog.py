@@ -1,3 +1,6 @@
+import asyncio
+import inspect
+
 
 class SupermarketCatalog:
 
@@ -7,3 +10,56 @@ class SupermarketCatalog:
     def unit_price(self, product):
         raise Exception("cannot be called from a unit test - it accesses the database")
 
+    def unit_prices(self, products):
+        """Look up the price of every product in one call.
+
+        Returns a dict keyed by product. Implementations backed by a
+        database should override this with a single round trip; the
+        default falls back to one unit_price call per product.
+        """
+        return {product: self.unit_price(product) for product in products}
+
+
+class AsyncSupermarketCatalog:
+    """The SupermarketCatalog protocol for catalogs reached over asyncio."""
+
+    def add_product(self, product, price):
+        raise Exception("cannot be called from a unit test - it accesses the database")
+
+    async def unit_price(self, product):
+        raise Exception("cannot be called from a unit test - it accesses the database")
+
+    async def unit_prices(self, products):
+        """Look up the price of every product without blocking the event loop.
+
+        The default issues every unit_price call concurrently; catalogs
+        with a bulk query should override this with a single await.
+        """
+        products = list(products)
+        prices = await asyncio.gather(*(self.unit_price(p) for p in products))
+        return dict(zip(products, prices))
+
+
+def unit_prices_of(catalog, products):
+    """catalog.unit_prices(products), for catalogs that predate unit_prices too.
+
+    A catalog written against the original protocol only has unit_price;
+    it is asked once per product instead.
+    """
+    bulk = getattr(catalog, "unit_prices", None)
+    if bulk is not None:
+        return bulk(products)
+    return {product: catalog.unit_price(product) for product in products}
+
+
+async def unit_prices_of_async(catalog, products):
+    """unit_prices_of for a catalog whose lookups may be awaitable."""
+    bulk = getattr(catalog, "unit_prices", None)
+    if bulk is not None:
+        prices = bulk(products)
+        return await prices if inspect.isawaitable(prices) else prices
+    products = list(products)
+    prices = [catalog.unit_price(product) for product in products]
+    if prices and inspect.isawaitable(prices[0]):
+        prices = await asyncio.gather(*prices)
+    return dict(zip(products, prices))
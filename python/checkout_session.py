@@ -0,0 +1,98 @@
+from typing import Optional, Union
+
+from model_objects import Discount, Product
+from receipt import Receipt
+from shopping_cart import ShoppingCart
+
+
+class CheckoutSession:
+    """Keeps a basket's totals up to date as items are scanned or voided.
+
+    Every scan updates the running subtotal and re-evaluates only the
+    scanned product's offer, so the till can show the total after each
+    scan without re-checking out the whole basket. receipt() returns what
+    Teller.checks_out_articles_from would for the same cart. The session
+    keeps the offers table that was current when it started, so every
+    scan is priced against the same version. Line totals, amounts and
+    the receipt come from the teller, so a MoneyTeller session stays in
+    Money.
+    """
+
+    def __init__(self, teller, cart: Optional[ShoppingCart] = None) -> None:
+        self.teller = teller
+        self.offer_table = teller.offer_plans.table
+        self.cart: ShoppingCart = ShoppingCart()
+        self._unit_prices: dict[Product, Union[int, float]] = {}
+        self._subtotal: Union[int, float] = 0
+        self._discounts: dict[Product, Discount] = {}
+        if cart is not None:
+            for pq in cart.items:
+                self.add_item_quantity(pq.product, pq.quantity)
+
+    @property
+    def subtotal(self) -> Union[int, float]:
+        return self.teller.amount(self._subtotal)
+
+    @property
+    def discounts(self) -> list[Discount]:
+        return list(self._discounts.values())
+
+    def total_price(self) -> Union[int, float]:
+        total = self._subtotal
+        for discount in self._discounts.values():
+            total += discount.discount_amount
+        return self.teller.amount(total)
+
+    def add_item(self, product: Product) -> None:
+        self.add_item_quantity(product, 1.0)
+
+    def add_item_quantity(
+        self,
+        product: Product,
+        quantity: Union[int, float]
+    ) -> None:
+        self.cart.add_item_quantity(product, quantity)
+        self._scanned(product, quantity)
+
+    def remove_item_quantity(
+        self,
+        product: Product,
+        quantity: Union[int, float]
+    ) -> None:
+        self.cart.remove_item_quantity(product, quantity)
+        self._scanned(product, -quantity)
+
+    def receipt(self) -> Receipt:
+        receipt = self.teller.price_items(self.cart, self._unit_prices)
+        receipt.offers_version = self.offer_table.version
+        for discount in self._discounts.values():
+            receipt.add_discount(discount)
+        return receipt
+
+    def _scanned(self, product: Product, quantity: Union[int, float]) -> None:
+        unit_price = self._unit_prices.get(product)
+        if unit_price is None:
+            unit_price = self._unit_prices[product] = self.teller.catalog.unit_price(product)
+        # Every scan or void is one cart line, so the running subtotal
+        # adds up exactly the line totals the receipt will hold.
+        self._subtotal += self.teller.line_total(quantity, unit_price)
+        self._update_discount(product, unit_price)
+
+    def _update_discount(self, product: Product, unit_price: Union[int, float]) -> None:
+        plan = self.offer_table.get(product)
+        if plan is None:
+            return
+        discount_amount = plan.calculate_discount(
+            self.cart.product_quantities[product], unit_price,
+            plan.argument, plan.offer_amount)
+        if not discount_amount:
+            self._discounts.pop(product, None)
+            return
+        is_new = product not in self._discounts
+        self._discounts[product] = Discount(product, plan.description, discount_amount)
+        if is_new:
+            # Keep discounts in cart order, as a full checkout lists them.
+            self._discounts = {
+                p: self._discounts[p]
+                for p in self.cart.product_quantities if p in self._discounts
+            }
@@ -0,0 +1,100 @@
+import threading
+from itertools import islice
+from typing import Hashable, Iterable, Optional, Union
+
+from lru import cacheable
+from model_objects import Discount, Product
+from offer_handler import OfferPlan
+
+_MISSING = object()
+
+
+class DiscountMemo:
+    """A bounded memo of the discount for one basket line, shared by baskets.
+
+    An offer's discount depends only on the compiled OfferPlan (handler,
+    argument, description) and on the line's quantity and unit price, so
+    the finished Discount, or None when the offer does not apply, is kept
+    under the plan, the product, the quantity and the unit price, with
+    the types of the argument, quantity and unit price. A changed offer
+    compiles to a different plan and a changed price is a different key,
+    so a stale result is never returned; Teller.replace_offers still
+    clears the memo, since a new table retires most of the old keys.
+
+    Hits read a plain dict without locking. Misses are stored, and the
+    statistics updated, under a lock once per basket, so one memo can
+    serve a Teller shared between threads. When the memo is full the
+    oldest quarter of the entries is dropped.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize: int = maxsize
+        self._entries: dict[Hashable, Optional[Discount]] = {}
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Forget every remembered discount; the statistics are kept."""
+        with self._lock:
+            self._entries = {}
+
+    def discounts(
+        self,
+        matches: Iterable[tuple[Product, Union[int, float], OfferPlan]],
+        unit_prices: dict[Product, Union[int, float]]
+    ) -> list[Discount]:
+        """The discounts for (product, quantity, plan) matches, in order."""
+        get = self._entries.get
+        found = []
+        computed = []
+        hits = 0
+        for p, quantity, plan in matches:
+            unit_price = unit_prices[p]
+            if not cacheable(quantity, unit_price):
+                key = None
+                discount = _MISSING
+            else:
+                key = (plan, type(plan.argument), p, quantity, type(quantity),
+                       unit_price, type(unit_price))
+                discount = get(key, _MISSING)
+            if discount is _MISSING:
+                discount_amount = plan.calculate_discount(
+                    quantity, unit_price, plan.argument, plan.offer_amount)
+                discount = (Discount(p, plan.description, discount_amount)
+                            if discount_amount else None)
+                computed.append((key, discount))
+            else:
+                hits += 1
+            if discount is not None:
+                found.append(discount)
+
+        if hits or computed:
+            with self._lock:
+                self.hits += hits
+                self.misses += len(computed)
+                entries = self._entries
+                for key, discount in computed:
+                    if key is not None:
+                        entries[key] = discount
+                if len(entries) > self.maxsize:
+                    self._evict(entries)
+        return found
+
+    def _evict(self, entries: dict[Hashable, Optional[Discount]]) -> None:
+        # Dicts keep insertion order, so the first keys are the oldest.
+        # Dropping a batch keeps eviction cheap per insert.
+        stale = list(islice(entries, len(entries) - self.maxsize * 3 // 4))
+        for key in stale:
+            del entries[key]
+        self.evictions += len(stale)
@@ -0,0 +1,150 @@
+import bisect
+import os
+import threading
+from typing import Sequence
+
+
+class CheckoutObserver:
+    """Receives timings and counts from the checkout pipeline.
+
+    Every hook is a no-op, so subclasses only override what they need.
+    Tellers and printers built without an observer never call these
+    hooks at all.
+    """
+
+    def stage(self, name: str, seconds: float) -> None:
+        """Wall time spent in one stage: catalog, items, offers, checkout or print."""
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter such as catalog_calls or offers_applied."""
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one sample of a size distribution such as receipt_lines."""
+
+
+DEFAULT_SECONDS_BUCKETS: tuple[float, ...] = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0
+)
+DEFAULT_SIZE_BUCKETS: tuple[float, ...] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 10000
+)
+
+
+class Histogram:
+    """Cumulative bucket counts, a sum and a count, as Prometheus exposes them."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, count) pairs ending with +Inf."""
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((_format_value(bound), running))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class MetricsAggregator(CheckoutObserver):
+    """Collects observer events in process and renders them for Prometheus.
+
+    Stage timings go to the ``<prefix>_stage_seconds`` histogram labelled
+    by stage, counters to ``<prefix>_<name>_total`` and size samples to
+    ``<prefix>_<name>`` histograms.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "supermarket",
+        seconds_buckets: Sequence[float] = DEFAULT_SECONDS_BUCKETS,
+        size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS
+    ) -> None:
+        self.prefix: str = prefix
+        self.seconds_buckets: Sequence[float] = seconds_buckets
+        self.size_buckets: Sequence[float] = size_buckets
+        self.stages: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+        self.distributions: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.stages.get(name)
+            if histogram is None:
+                histogram = self.stages[name] = Histogram(self.seconds_buckets)
+            histogram.add(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self.distributions.get(name)
+            if histogram is None:
+                histogram = self.distributions[name] = Histogram(self.size_buckets)
+            histogram.add(value)
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            if self.stages:
+                metric = f"{self.prefix}_stage_seconds"
+                lines.append(f"# HELP {metric} Wall time spent in each checkout stage.")
+                lines.append(f"# TYPE {metric} histogram")
+                for stage in sorted(self.stages):
+                    _render_histogram(lines, metric, self.stages[stage], f'stage="{stage}"')
+            for name in sorted(self.counters):
+                metric = f"{self.prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self.counters[name]}")
+            for name in sorted(self.distributions):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                _render_histogram(lines, metric, self.distributions[name], "")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the metrics to a file for a node_exporter style textfile scrape.
+
+        The file is replaced atomically so a scraper never reads half of it.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as out:
+            out.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.distributions.clear()
+
+
+def _render_histogram(
+    lines: list[str],
+    metric: str,
+    histogram: Histogram,
+    labels: str
+) -> None:
+    separator = "," if labels else ""
+    for bound, count in histogram.cumulative():
+        lines.append(f'{metric}_bucket{{{labels}{separator}le="{bound}"}} {count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {_format_value(histogram.sum)}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
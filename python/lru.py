@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Union
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize: int = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def cacheable(*values: Union[int, float]) -> bool:
+    """Whether values can be part of a cache key.
+
+    Zero is not: 0.0 and -0.0 are equal keys but render and compute
+    differently. NaN is not either, since it never equals itself.
+    """
+    for value in values:
+        if not value or value != value:
+            return False
+    return True
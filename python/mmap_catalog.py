@@ -0,0 +1,127 @@
+"""A read-only catalog answered straight from a memory-mapped snapshot file.
+
+File layout (little-endian):
+
+    header   magic (8 bytes), record count (u64), hash slots (u64)
+    records  count fixed-width records sorted by UTF-8 name:
+             name offset (u64), name length (u32), price (f64), unit (u8)
+    hash     open-addressing table of u32 record numbers plus one
+             (0 marks an empty slot), probed linearly from crc32(name)
+    names    the UTF-8 names, back to back
+
+Name lookups take one or two hash probes; the sorted records also allow
+binary search and ordered scans. Opening a catalog costs the same
+whatever its size, and every process that maps the same file shares its
+pages through the OS page cache.
+"""
+import mmap
+import os
+import struct
+import zlib
+from typing import Iterable, Optional, Union
+
+from catalog import SupermarketCatalog
+from model_objects import Product, ProductUnit
+
+MAGIC = b"SRCAT\x00\x01\x00"
+_HEADER = struct.Struct("<8sQQ")
+_RECORD = struct.Struct("<QIdB3x")
+_SLOT = struct.Struct("<I")
+
+
+def write_catalog_snapshot(
+    path: Union[str, os.PathLike],
+    products_and_prices: Iterable[tuple[Product, Union[int, float]]]
+) -> int:
+    """Write a snapshot file; returns the number of products written.
+
+    A product listed more than once keeps its last price, as it would
+    with repeated add_product calls.
+    """
+    entries: dict[bytes, tuple[Product, Union[int, float]]] = {}
+    for product, price in products_and_prices:
+        entries[product.name.encode()] = (product, price)
+    names = sorted(entries)
+    # At most half full, so probe chains stay short.
+    slot_count = 1 << max(1, (2 * len(names) - 1).bit_length())
+
+    table_start = _HEADER.size + _RECORD.size * len(names)
+    names_start = table_start + _SLOT.size * slot_count
+    records = bytearray()
+    slots = [0] * slot_count
+    blob = bytearray()
+    mask = slot_count - 1
+    for number, name in enumerate(names):
+        product, price = entries[name]
+        records += _RECORD.pack(names_start + len(blob), len(name), price, product.unit.value)
+        blob += name
+        slot = zlib.crc32(name) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = number + 1
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(names), slot_count))
+        f.write(records)
+        f.write(struct.pack(f"<{slot_count}I", *slots))
+        f.write(blob)
+    return len(names)
+
+
+class MmapCatalog(SupermarketCatalog):
+    """SupermarketCatalog backed by a snapshot from write_catalog_snapshot."""
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._slot_count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a catalog snapshot")
+        self._table_start = _HEADER.size + _RECORD.size * self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "MmapCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __reduce__(self):
+        # Worker processes re-map the file rather than copying its contents.
+        return MmapCatalog, (self.path,)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def add_product(self, product: Product, price: Union[int, float]) -> None:
+        raise Exception("a catalog snapshot is read-only")
+
+    def unit_price(self, product: Product) -> float:
+        record = self._find(product.name)
+        if record is None:
+            raise KeyError(product.name)
+        return record[2]
+
+    def product_with_name(self, name: str) -> Optional[Product]:
+        record = self._find(name)
+        if record is None:
+            return None
+        return Product(name, ProductUnit(record[3]))
+
+    def _find(self, name: str) -> Optional[tuple[int, int, float, int]]:
+        key = name.encode()
+        data = self._map
+        mask = self._slot_count - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            number, = _SLOT.unpack_from(data, self._table_start + slot * _SLOT.size)
+            if not number:
+                return None
+            record = _RECORD.unpack_from(data, _HEADER.size + (number - 1) * _RECORD.size)
+            if data[record[0]:record[0] + record[1]] == key:
+                return record
+            slot = (slot + 1) & mask
@@ -1,16 +1,63 @@
+import threading
 from enum import Enum
+from typing import NamedTuple, Union
+from weakref import WeakValueDictionary
 
 
 class Product:
-    def __init__(self, name, unit):
-        self.name = name
-        self.unit = unit
+    """An immutable product, interned by (name, unit).
 
+    Constructing a Product with a name and unit that already exist returns
+    the existing instance, so carts built from CSV rows or database reads
+    share one object per SKU. Because equal products are always the same
+    object, the default identity __eq__ and __hash__ compare by value.
+    """
 
-class ProductQuantity:
-    def __init__(self, product, quantity):
-        self.product = product
-        self.quantity = quantity
+    __slots__ = ('name', 'unit', '__weakref__')
+    _interned: "WeakValueDictionary[tuple[str, ProductUnit], Product]" = WeakValueDictionary()
+    _intern_lock = threading.Lock()
+
+    def __new__(cls, name, unit):
+        key = (name, unit)
+        product = cls._interned.get(key)
+        if product is None:
+            # Only creating a new product locks; lookups of existing ones don't.
+            with cls._intern_lock:
+                product = cls._interned.get(key)
+                if product is None:
+                    product = super().__new__(cls)
+                    object.__setattr__(product, 'name', name)
+                    object.__setattr__(product, 'unit', unit)
+                    cls._interned[key] = product
+        return product
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Product is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Product is immutable")
+
+    def __reduce__(self):
+        return Product, (self.name, self.unit)
+
+    @classmethod
+    def existing(cls, name):
+        """Every product called ``name`` that exists now, one per unit."""
+        interned = cls._interned
+        found = []
+        for unit in ProductUnit:
+            product = interned.get((name, unit))
+            if product is not None:
+                found.append(product)
+        return found
+
+    def __repr__(self):
+        return f"Product({self.name!r}, {self.unit})"
+
+
+class ProductQuantity(NamedTuple):
+    product: Product
+    quantity: Union[int, float]
 
 
 class ProductUnit(Enum):
@@ -25,15 +72,13 @@ class SpecialOfferType(Enum):
     FIVE_FOR_AMOUNT = 4
 
 
-class Offer:
-    def __init__(self, offer_type, product, argument):
-        self.offer_type = offer_type
-        self.product = product
-        self.argument = argument
+class Offer(NamedTuple):
+    offer_type: SpecialOfferType
+    product: Product
+    argument: Union[int, float]
 
 
-class Discount:
-    def __init__(self, product, description, discount_amount):
-        self.product = product
-        self.description = description
-        self.discount_amount = discount_amount
+class Discount(NamedTuple):
+    product: Product
+    description: str
+    discount_amount: Union[int, float]
@@ -0,0 +1,233 @@
+"""Exact money mode: integer minor units instead of floats.
+
+Money is an int holding an amount in minor units (cents). Arithmetic on
+it is plain integer arithmetic and returns int; wrapping a result back
+in Money marks it as an amount for printing. MoneyTeller prices carts
+with it:
+
+* Catalog prices are converted to cents once, rounding half away from
+  zero (0.995 -> 1.00).
+* An integer quantity multiplies the unit price exactly. Any other
+  quantity (KILO weights, 1.0 from add_item) is converted to an integer
+  count of millionths of its unit (milligrams for KILO), and the line
+  total is rounded once, half away from zero, to whole cents.
+* Each discount line is computed in integers from those line totals and
+  likewise rounded once, half away from zero.
+
+Money formats itself in major units with format(), str.format and
+f-strings, for every spec a Decimal accepts: format(Money(199), ".2f") is
+"1.99", so ReceiptPrinter prints it without going through float.
+printf-style formatting does not go through __format__, so
+"%.2f" % Money(199) is "199.00"; format Money with format() instead.
+"""
+import inspect
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterable, Optional, Union
+
+from catalog import SupermarketCatalog
+from model_objects import Offer, Product, SpecialOfferType
+from offer_handler import OfferHandler, OfferPlan
+from offer_index import OfferIndex
+from receipt import Receipt
+from teller import Teller
+
+MINOR_UNITS = 100
+MICRO_UNITS = 1_000_000
+
+
+class Money(int):
+    """An amount in minor units (cents)."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_amount(cls, amount: Union[int, float, str]) -> "Money":
+        """Convert an amount in major units, rounding half away from zero."""
+        if isinstance(amount, Money):
+            return amount
+        exact = Fraction(str(amount)) * MINOR_UNITS
+        return cls(_round_half_away(exact.numerator, exact.denominator))
+
+    @classmethod
+    def from_cents(cls, cents: Union[int, float, Fraction]) -> "Money":
+        """Round a fractional number of cents half away from zero."""
+        exact = Fraction(cents)
+        return cls(_round_half_away(exact.numerator, exact.denominator))
+
+    def __str__(self) -> str:
+        sign = "-" if self < 0 else ""
+        whole, cents = divmod(abs(int(self)), MINOR_UNITS)
+        return f"{sign}{whole}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money({int(self)})"
+
+    def __format__(self, spec: str) -> str:
+        """Format in major units, so format(Money(199), ".2f") == "1.99"."""
+        if spec == ".2f" or not spec:
+            return str(self)
+        return format(Decimal(int(self)).scaleb(-2), spec)
+
+
+def _round_half_away(numerator: int, denominator: int) -> int:
+    """numerator / denominator rounded half away from zero."""
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return -quotient if numerator < 0 else quotient
+
+
+def line_total(quantity: Union[int, float], unit_price: int) -> Money:
+    if type(quantity) is int:
+        return Money(quantity * unit_price)
+    micro_cents = round(quantity * MICRO_UNITS) * unit_price
+    # Inlined _round_half_away(micro_cents, MICRO_UNITS): this is the hot path.
+    if micro_cents >= 0:
+        return Money((micro_cents + MICRO_UNITS // 2) // MICRO_UNITS)
+    return Money(-((MICRO_UNITS // 2 - micro_cents) // MICRO_UNITS))
+
+
+@lru_cache(maxsize=256)
+def _percentage(argument: Union[int, float]) -> tuple[int, int]:
+    """The offer argument as an exact fraction of 1, as (numerator, denominator)."""
+    ratio = Fraction(str(argument)) / 100
+    return ratio.numerator, ratio.denominator
+
+
+class MoneyCatalog(SupermarketCatalog):
+    """Presents another catalog's prices as Money.
+
+    When the wrapped catalog is asynchronous, the lookups return
+    awaitables too.
+    """
+
+    def __init__(self, catalog: SupermarketCatalog) -> None:
+        self.catalog: SupermarketCatalog = catalog
+
+    def add_product(self, product: Product, price: Union[int, float]) -> None:
+        self.catalog.add_product(product, price)
+
+    def unit_price(self, product: Product) -> Union[Money, Awaitable[Money]]:
+        price = self.catalog.unit_price(product)
+        if inspect.isawaitable(price):
+            return _awaited(price, _to_money)
+        return _to_money(price)
+
+    def unit_prices(
+        self,
+        products: Iterable[Product]
+    ) -> Union[dict[Product, Money], Awaitable[dict[Product, Money]]]:
+        prices = self.catalog.unit_prices(products)
+        if inspect.isawaitable(prices):
+            return _awaited(prices, _to_money_prices)
+        return _to_money_prices(prices)
+
+
+def _to_money_prices(prices: dict[Product, Union[int, float]]) -> dict[Product, Money]:
+    return {product: _to_money(price) for product, price in prices.items()}
+
+
+async def _awaited(value: Awaitable, convert: Callable):
+    return convert(await value)
+
+
+@lru_cache(maxsize=65536)
+def _to_money(price: Union[int, float]) -> Money:
+    return Money.from_amount(price)
+
+
+class MoneyOfferHandler(OfferHandler):
+    """OfferHandler whose discounts are computed in integer cents.
+
+    Plans carry their argument already converted: Money for the "N for
+    amount" offers and (numerator, denominator) for percentages.
+    """
+
+    def compile_offer(self, offer: Offer) -> OfferPlan:
+        plan = super().compile_offer(offer)
+        if offer.offer_type is SpecialOfferType.TEN_PERCENT_DISCOUNT:
+            return plan._replace(argument=_percentage(offer.argument))
+        if offer.offer_type in (SpecialOfferType.TWO_FOR_AMOUNT,
+                                SpecialOfferType.FIVE_FOR_AMOUNT):
+            return plan._replace(argument=_to_money(offer.argument))
+        return plan
+
+    def _handle_three_for_two(
+        self,
+        quantity: Union[int, float],
+        unit_price: Money,
+        argument: Union[int, float],
+        offer_amount: int
+    ) -> Optional[Money]:
+        quantity_as_int = int(quantity)
+        if quantity_as_int <= 2:
+            return None
+        qualified_offer_count = quantity_as_int // offer_amount
+        paid = (qualified_offer_count * 2 + quantity_as_int % 3) * unit_price
+        return Money(paid - line_total(quantity, unit_price))
+
+    def _handle_two_for_amount(
+        self,
+        quantity: Union[int, float],
+        unit_price: Money,
+        argument: Money,
+        offer_amount: int
+    ) -> Optional[Money]:
+        quantity_as_int = int(quantity)
+        if quantity_as_int < offer_amount:
+            return None
+        total = (_round_half_away(argument * quantity_as_int, offer_amount)
+                 + quantity_as_int % 2 * unit_price)
+        return Money(total - line_total(quantity, unit_price))
+
+    def _handle_five_for_amount(
+        self,
+        quantity: Union[int, float],
+        unit_price: Money,
+        argument: Money,
+        offer_amount: int
+    ) -> Optional[Money]:
+        quantity_as_int = int(quantity)
+        if quantity_as_int < 5:
+            return None
+        qualified_offer_count = quantity_as_int // offer_amount
+        total = (argument * qualified_offer_count
+                 + quantity_as_int % 5 * unit_price)
+        return Money(total - line_total(quantity, unit_price))
+
+    def _handle_ten_percent_discount(
+        self,
+        quantity: Union[int, float],
+        unit_price: Money,
+        argument: tuple[int, int],
+        offer_amount: int
+    ) -> Money:
+        numerator, denominator = argument
+        return Money(-_round_half_away(
+            line_total(quantity, unit_price) * numerator, denominator))
+
+
+class MoneyReceipt(Receipt):
+    """A Receipt whose lines are Money; sums run on plain ints."""
+
+    def total_price(self) -> Money:
+        return Money(super().total_price())
+
+
+class MoneyTeller(Teller):
+    """A Teller whose receipts hold exact Money amounts."""
+
+    receipt_class = MoneyReceipt
+
+    def __init__(self, catalog, observer=None, discount_memo=None):
+        if not isinstance(catalog, MoneyCatalog):
+            catalog = MoneyCatalog(catalog)
+        super().__init__(catalog, observer, discount_memo)
+        self.offer_handler = MoneyOfferHandler()
+        self.offer_plans = OfferIndex(self.offer_handler)
+
+    def line_total(self, quantity, unit_price):
+        return line_total(quantity, unit_price)
+
+    def amount(self, value):
+        return Money(value)
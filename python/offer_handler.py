@@ -1,8 +1,16 @@
 import math
-from typing import Any, Optional, Union
+from typing import Any, Callable, NamedTuple, Optional, Union
 from model_objects import SpecialOfferType, Discount, Product, Offer
 
 
+class OfferPlan(NamedTuple):
+    """An offer compiled down to what the per-basket loop needs."""
+    calculate_discount: Callable[..., Optional[float]]
+    offer_amount: int
+    argument: Union[int, float]
+    description: str
+
+
 class OfferHandler:
     def __init__(self) -> None:
         self.offers_config: dict[SpecialOfferType, dict[str, Any]] = {
@@ -100,27 +108,92 @@ class OfferHandler:
         discount_amount = -quantity * unit_price * argument / 100.0
         return discount_amount
 
+    def compile_offer(self, offer: Offer) -> OfferPlan:
+        """Resolve everything about an offer that does not depend on the basket."""
+        offer_config = self.get_offer_config(offer.offer_type)
+        offer_amount = offer_config['quantity']
+        return OfferPlan(
+            offer_config['calculation_handler'],
+            offer_amount,
+            offer.argument,
+            self.format_description(
+                offer.offer_type, offer.argument, offer_amount
+            )
+        )
+
+    def compile_offers(
+        self,
+        offers: dict[Product, Offer]
+    ) -> dict[Product, OfferPlan]:
+        return {p: self.compile_offer(offer) for p, offer in offers.items()}
+
     def apply_offers(
         self,
         cart: Any,
         offers: dict[Product, Offer],
         catalog: Any,
+        receipt: Any,
+        unit_prices: Optional[dict[Product, Union[int, float]]] = None
+    ) -> None:
+        offered = {p: offers[p] for p in cart.product_quantities if p in offers}
+        if unit_prices is None:
+            unit_prices = catalog.unit_prices(offered.keys())
+        self.apply_offer_plans(
+            cart, self.compile_offers(offered), unit_prices, receipt)
+
+    async def apply_offers_async(
+        self,
+        cart: Any,
+        offers: dict[Product, Offer],
+        catalog: Any,
+        receipt: Any,
+        unit_prices: Optional[dict[Product, Union[int, float]]] = None
+    ) -> None:
+        """apply_offers for an AsyncSupermarketCatalog."""
+        offered = {p: offers[p] for p in cart.product_quantities if p in offers}
+        if unit_prices is None:
+            unit_prices = await catalog.unit_prices(offered.keys())
+        self.apply_offer_plans(
+            cart, self.compile_offers(offered), unit_prices, receipt)
+
+    def apply_offer_plans(
+        self,
+        cart: Any,
+        offer_plans: dict[Product, OfferPlan],
+        unit_prices: dict[Product, Union[int, float]],
         receipt: Any
     ) -> None:
         for p, quantity in cart.product_quantities.items():
-            offer = offers.get(p)
-            if not offer:
+            plan = offer_plans.get(p)
+            if plan is None:
                 continue
 
-            unit_price = catalog.unit_price(p)
-            offer_config = self.get_offer_config(offer.offer_type)
-            offer_amount = offer_config['quantity']
-            calculate_discount = offer_config['calculation_handler']
-            discount_amount = calculate_discount(
-                quantity, unit_price, offer.argument, offer_amount
+            discount_amount = plan.calculate_discount(
+                quantity, unit_prices[p], plan.argument, plan.offer_amount
             )
-            disc_description = self.format_description(
-                offer.offer_type, offer.argument, offer_amount
+            if discount_amount:
+                receipt.add_discount(Discount(p, plan.description, discount_amount))
+
+    def apply_offer_index(
+        self,
+        cart: Any,
+        offer_index: Any,
+        unit_prices: dict[Product, Union[int, float]],
+        receipt: Any,
+        memo: Any = None
+    ) -> None:
+        """apply_offer_plans for an offer_index.OfferIndex or OfferTable.
+
+        ``memo`` is an optional discount_memo.DiscountMemo shared across
+        baskets.
+        """
+        if memo is not None:
+            for discount in memo.discounts(offer_index.matches(cart), unit_prices):
+                receipt.add_discount(discount)
+            return
+        for p, quantity, plan in offer_index.matches(cart):
+            discount_amount = plan.calculate_discount(
+                quantity, unit_prices[p], plan.argument, plan.offer_amount
             )
             if discount_amount:
-                receipt.add_discount(Discount(p, disc_description, discount_amount))
+                receipt.add_discount(Discount(p, plan.description, discount_amount))
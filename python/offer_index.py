@@ -0,0 +1,171 @@
+import threading
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, NamedTuple, Optional, Union
+
+from model_objects import Offer, Product, ProductUnit
+from offer_handler import OfferHandler, OfferPlan
+
+OfferMatch = tuple[Product, Union[int, float], OfferPlan]
+
+
+class OfferTable(NamedTuple):
+    """One published version of the offers, keyed by product name.
+
+    A table is never changed after it is published: OfferIndex builds a
+    new one for every change. A checkout that reads the table once prices
+    the whole basket against a single version, without taking a lock.
+    """
+    version: int
+    offers: dict[str, Offer]
+    plans: dict[str, OfferPlan]
+
+    def get(
+        self,
+        product: Product,
+        default: Optional[OfferPlan] = None
+    ) -> Optional[OfferPlan]:
+        return self.plans.get(product.name, default)
+
+    def matches(self, cart: Any) -> list[OfferMatch]:
+        """(product, quantity, plan) for every offered product in the cart.
+
+        Walks whichever of the cart and the offer table is smaller and
+        returns the matches in cart order, as a full cart walk would.
+        """
+        plans = self.plans
+        quantities = cart.product_quantities
+        if len(quantities) <= len(plans) * len(ProductUnit):
+            get = plans.get
+            return [
+                (product, quantity, plan)
+                for product, quantity in quantities.items()
+                if (plan := get(product.name)) is not None
+            ]
+
+        # A large basket against a small table. Products are interned by
+        # (name, unit), so the products that can share an offer's name
+        # are the existing ones with that name, whatever their unit.
+        found = {}
+        for name, plan in plans.items():
+            for product in Product.existing(name):
+                quantity = quantities.get(product)
+                if quantity is not None:
+                    found[product] = (product, quantity, plan)
+        if len(found) <= 1:
+            return list(found.values())
+        # Put the matches back in cart order, stopping at the last one.
+        ordered = []
+        remaining = len(found)
+        for product in quantities:
+            match = found.get(product)
+            if match is not None:
+                ordered.append(match)
+                remaining -= 1
+                if not remaining:
+                    break
+        return ordered
+
+
+class OfferIndex:
+    """Publishes versioned OfferTables of compiled offers.
+
+    Lookups go by name rather than by Product identity, so a cart built
+    from another data source still finds its offers. Writers change a
+    private draft and bump the version; the next read of ``table``
+    publishes a copy of the draft with a single assignment. A run of
+    writes therefore costs one copy, and readers never lock once the
+    table is published.
+    """
+
+    def __init__(
+        self,
+        offer_handler: OfferHandler,
+        offers: Iterable[Offer] = ()
+    ) -> None:
+        self.offer_handler: OfferHandler = offer_handler
+        self._offers: dict[str, Offer] = {}
+        self._plans: dict[str, OfferPlan] = {}
+        self._version: int = 0
+        # None when the draft has changed since the table was published.
+        self._table: Optional[OfferTable] = OfferTable(0, {}, {})
+        self._write_lock = threading.Lock()
+        # (table, view) for the offers property, rebuilt once per table.
+        self._offers_view: Optional[tuple[OfferTable, Mapping[Product, Offer]]] = None
+        if offers:
+            self.replace_all(offers)
+
+    @property
+    def table(self) -> OfferTable:
+        table = self._table
+        if table is None:
+            with self._write_lock:
+                table = self._table
+                if table is None:
+                    table = self._table = OfferTable(
+                        self._version, dict(self._offers), dict(self._plans))
+        return table
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self.table.plans)
+
+    def __contains__(self, product: Product) -> bool:
+        return product.name in self.table.plans
+
+    def get(
+        self,
+        product: Product,
+        default: Optional[OfferPlan] = None
+    ) -> Optional[OfferPlan]:
+        return self.table.plans.get(product.name, default)
+
+    @property
+    def offers(self) -> Mapping[Product, Offer]:
+        """A read-only view of the current offers, keyed by product."""
+        table = self.table
+        view = self._offers_view
+        if view is None or view[0] is not table:
+            view = self._offers_view = (table, MappingProxyType(
+                {offer.product: offer for offer in table.offers.values()}))
+        return view[1]
+
+    def matches(self, cart: Any) -> list[OfferMatch]:
+        return self.table.matches(cart)
+
+    def add(self, offer: Offer) -> None:
+        name = offer.product.name
+        plan = self.offer_handler.compile_offer(offer)
+        with self._write_lock:
+            self._offers[name] = offer
+            self._plans[name] = plan
+            self._changed()
+
+    def remove(self, product: Product) -> None:
+        with self._write_lock:
+            if product.name not in self._plans:
+                return
+            del self._offers[product.name]
+            del self._plans[product.name]
+            self._changed()
+
+    def replace_all(self, offers: Iterable[Offer]) -> OfferTable:
+        """Compile ``offers`` into a new table and publish it in one step."""
+        by_name: dict[str, Offer] = {}
+        for offer in offers:
+            by_name[offer.product.name] = offer
+        compile_offer = self.offer_handler.compile_offer
+        plans = {name: compile_offer(offer) for name, offer in by_name.items()}
+        with self._write_lock:
+            self._offers = dict(by_name)
+            self._plans = dict(plans)
+            self._version += 1
+            self._table = OfferTable(self._version, by_name, plans)
+            return self._table
+
+    def _changed(self) -> None:
+        # Called with the write lock held.
+        self._version += 1
+        self._table = None
@@ -0,0 +1,164 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Union
+
+from catalog import SupermarketCatalog, unit_prices_of
+from discount_memo import DiscountMemo
+from model_objects import Offer, Product
+from offer_handler import OfferHandler
+from offer_index import OfferIndex
+from receipt import Receipt
+from shopping_cart import ShoppingCart
+from teller import Teller
+
+# Carts go to the workers as plain (product, quantity) rows, which pickle
+# smaller than carts. Products unpickle to the interned instance for
+# their (name, unit), so rice by the kilo and rice each stay apart.
+# Receipts come back whole: Receipt pickles compactly, so this process
+# does no rebuilding.
+CartRows = list[tuple[Product, Union[int, float]]]
+
+
+class CatalogSnapshot(SupermarketCatalog):
+    """A frozen, picklable copy of the prices a batch of carts needs."""
+
+    def __init__(self, prices: dict[Product, Union[int, float]]) -> None:
+        self.prices: dict[Product, Union[int, float]] = prices
+
+    @classmethod
+    def of(
+        cls,
+        catalog: SupermarketCatalog,
+        products: Iterable[Product]
+    ) -> "CatalogSnapshot":
+        return cls(dict(unit_prices_of(catalog, products)))
+
+    def add_product(self, product: Product, price: Union[int, float]) -> None:
+        raise Exception("a catalog snapshot is read-only")
+
+    def unit_price(self, product: Product) -> Union[int, float]:
+        return self.prices[product]
+
+    def unit_prices(self, products: Iterable[Product]) -> dict[Product, Union[int, float]]:
+        prices = self.prices
+        return {product: prices[product] for product in products}
+
+
+_worker_teller: Optional[Teller] = None
+_worker_version: Optional[int] = None
+
+
+def _init_worker(
+    teller_class: type,
+    offer_handler: OfferHandler,
+    memo_size: Optional[int],
+    snapshot: CatalogSnapshot,
+    offers: list[Offer],
+    version: int
+) -> None:
+    global _worker_teller, _worker_version
+    teller = teller_class(snapshot)
+    teller.offer_handler = offer_handler
+    teller.offer_plans = OfferIndex(offer_handler)
+    if memo_size is not None:
+        teller.discount_memo = DiscountMemo(memo_size)
+    teller.replace_offers(offers)
+    _worker_teller = teller
+    _worker_version = version
+
+
+def _check_out_chunk(chunk: list[CartRows], lazy: bool) -> list[Receipt]:
+    teller = _worker_teller
+    carts = []
+    for rows in chunk:
+        cart = ShoppingCart()
+        for product, quantity in rows:
+            cart.add_item_quantity(product, quantity)
+        carts.append(cart)
+    if lazy:
+        # A deferred offer pass cannot cross the process boundary; the
+        # parent defers it on its own side.
+        unit_prices = teller.catalog.unit_prices(teller.products_of(carts))
+        receipts = [teller.price_items(cart, unit_prices) for cart in carts]
+    else:
+        receipts = teller.checkout_many(carts)
+    for receipt in receipts:
+        receipt.offers_version = _worker_version
+    return receipts
+
+
+class ParallelCheckout:
+    """Check out large batches of carts on a pool of worker processes.
+
+    Each worker builds a teller of the same class, offer handler and
+    discount memo size as ``teller`` (the class must accept a catalog as
+    its only argument), receives a snapshot of the catalog
+    prices and the offers table once, then checks out chunks of carts
+    and returns finished receipts. Receipts come back in input order and
+    match serial checkout exactly. With ``lazy`` the workers only price
+    the items, and the offers are deferred in this process as
+    Teller.checkout_many does.
+    """
+
+    def __init__(
+        self,
+        teller: Teller,
+        max_workers: Optional[int] = None,
+        chunksize: int = 512
+    ) -> None:
+        if chunksize <= 0:
+            raise ValueError("chunksize must be positive")
+        self.teller: Teller = teller
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.chunksize: int = chunksize
+
+    def checkout_many(self, carts: Iterable[ShoppingCart], lazy: bool = False) -> list[Receipt]:
+        carts = list(carts)
+        teller = self.teller
+        products = teller.products_of(carts)
+        snapshot = CatalogSnapshot.of(teller.catalog, products)
+        offer_table = teller.offer_plans.table
+        names = {p.name for p in products}
+        offers = [offer for name, offer in offer_table.offers.items() if name in names]
+        memo = teller.discount_memo
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(type(teller), teller.offer_handler,
+                      memo.maxsize if memo is not None else None,
+                      snapshot, offers, offer_table.version)
+        ) as executor:
+            receipts = []
+            for chunk in self._submit(executor, self._chunks(carts), lazy):
+                receipts.extend(chunk)
+
+        if lazy:
+            unit_prices = snapshot.unit_prices(products)
+            for cart, receipt in zip(carts, receipts):
+                teller.defer_offers(cart, offer_table, unit_prices, receipt)
+        return receipts
+
+    def _submit(
+        self,
+        executor: ProcessPoolExecutor,
+        chunks: Iterator[list[CartRows]],
+        lazy: bool
+    ) -> Iterator[list[Receipt]]:
+        # Keep two chunks per worker in flight rather than submitting the
+        # whole batch up front, so pickled carts and receipts waiting in
+        # the queues stay bounded.
+        pending: deque[Future] = deque()
+        for chunk in chunks:
+            if len(pending) >= 2 * self.max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_check_out_chunk, chunk, lazy))
+        while pending:
+            yield pending.popleft().result()
+
+    def _chunks(self, carts: list[ShoppingCart]) -> Iterator[list[CartRows]]:
+        rows = (list(map(tuple, cart.items)) for cart in carts)
+        while chunk := list(islice(rows, self.chunksize)):
+            yield chunk
@@ -1,34 +1,108 @@
 
-from typing import Union
+from collections.abc import Sequence
+from typing import Callable, Generic, Iterator, NamedTuple, Optional, TypeVar, Union
 from model_objects import Product, Discount
 
+T = TypeVar('T')
 
-class ReceiptItem:
-    def __init__(
-        self,
-        product: Product,
-        quantity: Union[int, float],
-        price: Union[int, float],
-        total_price: Union[int, float]
-    ) -> None:
-        self.product: Product = product
-        self.quantity: Union[int, float] = quantity
-        self.price: Union[int, float] = price
-        self.total_price: Union[int, float] = total_price
+
+class ReceiptItem(NamedTuple):
+    product: Product
+    quantity: Union[int, float]
+    price: Union[int, float]
+    total_price: Union[int, float]
+
+
+# Bound once: building from a tuple skips ReceiptItem's argument handling.
+_make_receipt_item = ReceiptItem._make
+_make_discount = Discount._make
+
+
+class SequenceView(Sequence, Generic[T]):
+    """A read-only, zero-copy view of a list owned by someone else."""
+
+    __slots__ = ('_list',)
+
+    def __init__(self, backing: list[T]) -> None:
+        self._list = backing
+
+    def __getitem__(self, index):
+        return self._list[index]
+
+    def __len__(self) -> int:
+        return len(self._list)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._list)
+
+    def __repr__(self) -> str:
+        return f"SequenceView({self._list!r})"
 
 
 class Receipt:
     def __init__(self) -> None:
         self._items: list[ReceiptItem] = []
         self._discounts: list[Discount] = []
+        # Running sums in the same order total_price() has always added
+        # them (items first, then discounts), so cached totals are exact.
+        self._items_total: Union[int, float] = 0
+        self._total: Optional[Union[int, float]] = 0
+        # The version of the teller's offers table this receipt was priced with.
+        self.offers_version: Optional[int] = None
+        # Set by defer_discounts; runs before the discounts are first read.
+        self._pending_discounts: Optional[Callable[["Receipt"], None]] = None
+        # Set when unpickled: the items as plain tuples, made into
+        # ReceiptItems the first time the items are read or added to.
+        self._item_rows: Optional[list[tuple]] = None
+
+    def defer_discounts(self, apply: Callable[["Receipt"], None]) -> None:
+        """Add the discounts later, by calling ``apply(self)`` once.
+
+        The call happens the first time the discounts or the total are
+        read, or just before another discount is added, so the receipt
+        ends up exactly as if ``apply`` had run now.
+        """
+        self._pending_discounts = apply
+
+    def _apply_pending_discounts(self) -> None:
+        apply = self._pending_discounts
+        if apply is not None:
+            self._pending_discounts = None
+            apply(self)
+
+    def _load_item_rows(self) -> None:
+        self._items = list(map(_make_receipt_item, self._item_rows))
+        self._item_rows = None
+
+    def __reduce__(self):
+        # Items and discounts pickle as plain tuples, which load much
+        # faster than NamedTuples, and the items stay tuples until read.
+        # The running totals travel unchanged, so the copy's total_price()
+        # is exactly the original's. A deferred offer pass runs first,
+        # since it cannot be pickled.
+        if self._pending_discounts is not None:
+            self._apply_pending_discounts()
+        state = self.__dict__.copy()
+        items = state.pop('_items')
+        item_rows = state.pop('_item_rows')
+        if item_rows is None:
+            item_rows = list(map(tuple, items))
+        discount_rows = list(map(tuple, state.pop('_discounts')))
+        del state['_pending_discounts']
+        args = (type(self), item_rows, discount_rows, state.pop('_items_total'),
+                state.pop('_total'), state.pop('offers_version'))
+        # Only a subclass's own attributes are left; none is the norm.
+        return (_restore_receipt, args, state or None)
 
     def total_price(self) -> Union[int, float]:
-        total = 0
-        for item in self.items:
-            total += item.total_price
-        for discount in self.discounts:
-            total += discount.discount_amount
-        return total
+        if self._pending_discounts is not None:
+            self._apply_pending_discounts()
+        if self._total is None:
+            total = self._items_total
+            for discount in self._discounts:
+                total += discount.discount_amount
+            self._total = total
+        return self._total
 
     def add_product(
         self,
@@ -37,15 +111,64 @@ class Receipt:
         price: Union[int, float],
         total_price: Union[int, float]
     ) -> None:
-        self._items.append(ReceiptItem(product, quantity, price, total_price))
+        if self._item_rows is not None:
+            self._load_item_rows()
+        self._items.append(_make_receipt_item((product, quantity, price, total_price)))
+        self._items_total += total_price
+        # An item added after a discount changes the summation order, so
+        # the total is recomputed on the next read instead.
+        self._total = None if self._discounts else self._items_total
 
     def add_discount(self, discount: Discount) -> None:
+        if self._pending_discounts is not None:
+            self._apply_pending_discounts()
         self._discounts.append(discount)
+        if self._total is not None:
+            self._total += discount.discount_amount
 
     @property
     def items(self) -> list[ReceiptItem]:
+        """A copy of the items, safe for the caller to mutate."""
+        if self._item_rows is not None:
+            self._load_item_rows()
         return self._items[:]
 
     @property
     def discounts(self) -> list[Discount]:
+        """A copy of the discounts, safe for the caller to mutate."""
+        if self._pending_discounts is not None:
+            self._apply_pending_discounts()
         return self._discounts[:]
+
+    @property
+    def item_view(self) -> SequenceView[ReceiptItem]:
+        """The items without copying; reflects later additions."""
+        if self._item_rows is not None:
+            self._load_item_rows()
+        return SequenceView(self._items)
+
+    @property
+    def discount_view(self) -> SequenceView[Discount]:
+        """The discounts without copying; reflects later additions."""
+        if self._pending_discounts is not None:
+            self._apply_pending_discounts()
+        return SequenceView(self._discounts)
+
+
+def _restore_receipt(
+    cls: type,
+    item_rows: list[tuple],
+    discount_rows: list[tuple],
+    items_total: Union[int, float],
+    total: Optional[Union[int, float]],
+    offers_version: Optional[int]
+) -> Receipt:
+    receipt = cls.__new__(cls)
+    receipt._items = []
+    receipt._item_rows = item_rows
+    receipt._discounts = list(map(_make_discount, discount_rows))
+    receipt._items_total = items_total
+    receipt._total = total
+    receipt.offers_version = offers_version
+    receipt._pending_discounts = None
+    return receipt
@@ -0,0 +1,325 @@
+"""Group-by queries over a receipt archive.
+
+Every query scans the archive's columns chunk by chunk and never builds
+Receipt objects. With NumPy installed, each chunk is grouped with a few
+array operations. Otherwise the columns are walked in plain Python. Both
+paths add amounts in the same order, so they return identical sums.
+Archives of Money receipts give Money results, means and quantiles
+included (rounded half away from zero to the cent), and histogram
+edges are always in major units.
+"""
+import bisect
+import math
+import re
+from fractions import Fraction
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+from model_objects import Product, SpecialOfferType
+from money import Money
+from offer_handler import OfferHandler
+from receipt_archive import ArchiveChunk, ReceiptArchive
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None
+
+HAVE_NUMPY = np is not None
+
+Number = Union[int, float]
+SECONDS_PER_HOUR = 3600
+
+_DESCRIPTION_PATTERNS = [
+    (re.compile(re.escape(config["description_temp"])
+                .replace(re.escape("{argument}"), ".+") + r"\Z"), offer_type)
+    for offer_type, config in OfferHandler().offers_config.items()
+]
+
+
+def offer_type_of(description: str) -> Optional[SpecialOfferType]:
+    """The offer type whose description template produced ``description``."""
+    for pattern, offer_type in _DESCRIPTION_PATTERNS:
+        if pattern.match(description):
+            return offer_type
+    return None
+
+
+class TotalSummary(NamedTuple):
+    count: int
+    sum: Number
+    minimum: Optional[Number]
+    maximum: Optional[Number]
+    mean: Optional[Number]
+
+
+def sales_by_product(
+    archive: ReceiptArchive,
+    use_numpy: Optional[bool] = None
+) -> dict[Product, Number]:
+    """The sum of item line totals per product."""
+    use_numpy = _resolve(use_numpy)
+    pairs = ((_column(c.item_products, use_numpy), _column(c.item_totals, use_numpy))
+             for c in archive.chunks())
+    sums = _sum_by_id(pairs, len(archive.products), archive.money, use_numpy)
+    return {archive.products[key]: amount for key, amount in _amounts(sums, archive)}
+
+
+def discounts_by_product(
+    archive: ReceiptArchive,
+    use_numpy: Optional[bool] = None
+) -> dict[Product, Number]:
+    """The sum of discount amounts per product."""
+    use_numpy = _resolve(use_numpy)
+    pairs = ((_column(c.discount_products, use_numpy), _column(c.discount_amounts, use_numpy))
+             for c in archive.chunks())
+    sums = _sum_by_id(pairs, len(archive.products), archive.money, use_numpy)
+    return {archive.products[key]: amount for key, amount in _amounts(sums, archive)}
+
+
+def discounts_by_description(
+    archive: ReceiptArchive,
+    use_numpy: Optional[bool] = None
+) -> dict[str, Number]:
+    """The sum of discount amounts per offer description, e.g. "10.0% off"."""
+    use_numpy = _resolve(use_numpy)
+    pairs = ((_column(c.discount_descriptions, use_numpy),
+              _column(c.discount_amounts, use_numpy))
+             for c in archive.chunks())
+    sums = _sum_by_id(pairs, len(archive.descriptions), archive.money, use_numpy)
+    return {archive.descriptions[key]: amount for key, amount in _amounts(sums, archive)}
+
+
+def discounts_by_offer_type(
+    archive: ReceiptArchive,
+    use_numpy: Optional[bool] = None
+) -> dict[Optional[SpecialOfferType], Number]:
+    """The sum of discount amounts per SpecialOfferType.
+
+    Archives store descriptions rather than offer types, so each
+    description is matched against the OfferHandler templates; ones that
+    match no template are counted under None.
+    """
+    totals: dict[Optional[SpecialOfferType], Number] = {}
+    for description, amount in discounts_by_description(archive, use_numpy).items():
+        offer_type = offer_type_of(description)
+        totals[offer_type] = totals.get(offer_type, 0) + amount
+    if archive.money:
+        return {offer_type: Money(amount) for offer_type, amount in totals.items()}
+    return totals
+
+
+def discounts_by_hour(
+    archive: ReceiptArchive,
+    by_product: bool = False,
+    use_numpy: Optional[bool] = None
+) -> dict:
+    """The sum of discount amounts per hour, keyed by the hour's epoch second.
+
+    With ``by_product`` the keys are (hour, product) pairs. Receipts
+    archived without a timestamp are left out.
+    """
+    use_numpy = _resolve(use_numpy)
+    product_count = max(1, len(archive.products))
+    pairs = (_hourly_discounts(chunk, by_product, product_count, use_numpy)
+             for chunk in archive.chunks())
+    sums = _sum_by_key(pairs, archive.money, use_numpy)
+    result = {}
+    for key, amount in _amounts(sums, archive):
+        if by_product:
+            hour, product_id = divmod(key, product_count)
+            result[(hour * SECONDS_PER_HOUR, archive.products[product_id])] = amount
+        else:
+            result[key * SECONDS_PER_HOUR] = amount
+    return result
+
+
+def total_summary(archive: ReceiptArchive) -> TotalSummary:
+    totals = archive.scan_totals()
+    if not totals:
+        return TotalSummary(0, 0, None, None, None)
+    total = sum(totals)
+    if archive.money:
+        return TotalSummary(len(totals), Money(total), Money(min(totals)), Money(max(totals)),
+                            Money.from_cents(Fraction(total, len(totals))))
+    return TotalSummary(len(totals), total, min(totals), max(totals), total / len(totals))
+
+
+def total_histogram(
+    archive: ReceiptArchive,
+    edges: Sequence[Number],
+    use_numpy: Optional[bool] = None
+) -> list[int]:
+    """Receipt counts per bin of total price, binned like numpy.histogram.
+
+    Bin i holds totals in [edges[i], edges[i + 1]); the last bin also
+    holds totals equal to the last edge. Totals outside the edges are
+    not counted. Edges are in major units, for Money archives too.
+    """
+    if len(edges) < 2 or any(a >= b for a, b in zip(edges, edges[1:])):
+        raise ValueError("edges must be at least two increasing values")
+    if archive.money:
+        # Compare exact cents with exact cents.
+        edges = [Money.from_amount(edge) for edge in edges]
+    totals = archive.scan_totals()
+    if _resolve(use_numpy):
+        counts, _ = np.histogram(np.frombuffer(totals, dtype=totals.typecode), bins=edges)
+        return counts.tolist()
+    counts = [0] * (len(edges) - 1)
+    last = len(edges) - 1
+    for total in totals:
+        if total == edges[-1]:
+            counts[-1] += 1
+            continue
+        index = bisect.bisect_right(edges, total)
+        if 0 < index <= last:
+            counts[index - 1] += 1
+    return counts
+
+
+def total_quantiles(
+    archive: ReceiptArchive,
+    quantiles: Sequence[float],
+    use_numpy: Optional[bool] = None
+) -> list[Number]:
+    """Quantiles of the receipt totals, linearly interpolated.
+
+    Money archives give Money quantiles, rounded to the cent.
+    """
+    if any(not 0 <= q <= 1 for q in quantiles):
+        raise ValueError("quantiles must be between 0 and 1")
+    totals = archive.scan_totals()
+    if not totals:
+        return [math.nan] * len(quantiles)
+    if _resolve(use_numpy):
+        values = np.frombuffer(totals, dtype=totals.typecode)
+        result = np.quantile(values, quantiles).tolist()
+    else:
+        ordered = sorted(totals)
+        result = []
+        for q in quantiles:
+            position = q * (len(ordered) - 1)
+            low = math.floor(position)
+            high = min(low + 1, len(ordered) - 1)
+            result.append(ordered[low] + (ordered[high] - ordered[low]) * (position - low))
+    if archive.money:
+        return [Money.from_cents(value) for value in result]
+    return result
+
+
+def _resolve(use_numpy: Optional[bool]) -> bool:
+    if use_numpy is None:
+        return HAVE_NUMPY
+    if use_numpy and not HAVE_NUMPY:
+        raise ImportError("NumPy is required for use_numpy=True")
+    return use_numpy
+
+
+def _column(view: memoryview, use_numpy: bool):
+    # NumPy gets a copy: the view is released when the chunk scan moves on.
+    if use_numpy:
+        return np.frombuffer(view, dtype=view.format).copy()
+    return view.tolist()
+
+
+def _hourly_discounts(
+    chunk: ArchiveChunk,
+    by_product: bool,
+    product_count: int,
+    use_numpy: bool
+):
+    """(key, amount) columns for one chunk's time-stamped discounts."""
+    if use_numpy:
+        counts = _column(chunk.receipt_discount_counts, True)
+        timestamps = np.repeat(_column(chunk.timestamps, True), counts)
+        amounts = _column(chunk.discount_amounts, True)
+        stamped = ~np.isnan(timestamps)
+        keys = np.floor_divide(timestamps[stamped], SECONDS_PER_HOUR).astype(np.int64)
+        if by_product:
+            keys = keys * product_count + _column(chunk.discount_products, True)[stamped]
+        return keys, amounts[stamped]
+
+    keys, amounts = [], []
+    rows = zip(chunk.discount_products.tolist(), chunk.discount_amounts.tolist())
+    for count, timestamp in zip(chunk.receipt_discount_counts.tolist(),
+                                chunk.timestamps.tolist()):
+        for _ in range(count):
+            product_id, amount = next(rows)
+            if timestamp != timestamp:
+                continue
+            hour = int(timestamp // SECONDS_PER_HOUR)
+            keys.append(hour * product_count + product_id if by_product else hour)
+            amounts.append(amount)
+    return keys, amounts
+
+
+def _sum_by_key(
+    pairs: Iterable[tuple],
+    money: bool,
+    use_numpy: bool
+) -> dict[int, Number]:
+    """Sum values per key, one chunk at a time, in row order within a chunk."""
+    totals: dict[int, Number] = {}
+    for keys, values in pairs:
+        if not len(keys):
+            continue
+        if use_numpy:
+            unique, inverse = np.unique(keys, return_inverse=True)
+            if money:
+                partial = np.zeros(len(unique), dtype=np.int64)
+                np.add.at(partial, inverse, values)
+            else:
+                partial = np.bincount(inverse, weights=values, minlength=len(unique))
+            chunk_sums: Iterable = zip(unique.tolist(), partial.tolist())
+        else:
+            sums: dict[int, Number] = {}
+            for key, value in zip(keys, values):
+                sums[key] = sums.get(key, 0) + value
+            chunk_sums = sums.items()
+        for key, amount in chunk_sums:
+            totals[key] = totals.get(key, 0) + amount
+    return totals
+
+
+def _sum_by_id(
+    pairs: Iterable[tuple],
+    size: int,
+    money: bool,
+    use_numpy: bool
+) -> dict[int, Number]:
+    """_sum_by_key for dense dictionary ids in range(size)."""
+    if not use_numpy:
+        return _sum_by_key(pairs, money, use_numpy)
+    running = np.zeros(size, dtype=np.int64 if money else np.float64)
+    seen = np.zeros(size, dtype=bool)
+    for keys, values in pairs:
+        if not len(keys):
+            continue
+        # Small chunks against a large dictionary group the ids present;
+        # otherwise count into a full-size array without sorting.
+        if 4 * len(keys) < size:
+            ids, keys = np.unique(keys, return_inverse=True)
+        else:
+            ids = None
+        bins = size if ids is None else len(ids)
+        if money:
+            partial = np.zeros(bins, dtype=np.int64)
+            np.add.at(partial, keys, values)
+        else:
+            partial = np.bincount(keys, weights=values, minlength=bins)
+        if ids is None:
+            running += partial
+            seen[keys] = True
+        else:
+            running[ids] += partial
+            seen[ids] = True
+    present = np.flatnonzero(seen)
+    return dict(zip(present.tolist(), running[present].tolist()))
+
+
+def _amounts(
+    sums: dict[int, Number],
+    archive: ReceiptArchive
+) -> Iterator[tuple[int, Number]]:
+    for key in sorted(sums):
+        amount = sums[key]
+        yield key, Money(amount) if archive.money else amount
@@ -0,0 +1,336 @@
+"""A compact columnar file format for archiving receipts.
+
+File layout (little-endian; columns are written in native byte order, so
+archives are produced and read on little-endian hosts):
+
+    magic    8 bytes
+    chunks   up to chunk_size receipts each, every column padded to 8 bytes:
+             header   b"CHNK", receipt count (u32), item count (u32),
+                      discount count (u32)
+             receipts item count (u32), discount count (u32),
+                      offers version (i64, -1 when unknown),
+                      timestamp (f64, NaN when unknown), total (amount)
+             items    product id (u32), quantity (f64),
+                      quantity was an int (u8), price (amount), total (amount)
+             discounts product id (u32), description id (u32), amount (amount)
+    footer   UTF-8 JSON: the product and description dictionaries shared
+             by every chunk, whether amounts are Money, and the offset and
+             counts of every chunk
+    trailer  footer offset (u64), end magic (8 bytes)
+
+Amounts are f64, or i64 cents when the archive holds Money receipts.
+Receipts stream in and out one chunk at a time. Because every column is
+a flat array in a memory-mapped file, totals and other columns can be
+scanned without building any Python objects.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Union
+
+from model_objects import Discount, Product, ProductUnit
+from money import Money, MoneyReceipt
+from receipt import Receipt
+
+MAGIC = b"SRRCPT\x00\x01"
+END_MAGIC = b"SRRCPEND"
+_CHUNK = struct.Struct("<4sIII")
+_TRAILER = struct.Struct("<Q8s")
+_NO_VERSION = -1
+
+
+class ArchiveChunk(NamedTuple):
+    """Zero-copy views of one chunk's columns, indexed like numpy arrays."""
+    receipt_item_counts: memoryview
+    receipt_discount_counts: memoryview
+    offers_versions: memoryview
+    timestamps: memoryview
+    totals: memoryview
+    item_products: memoryview
+    item_quantities: memoryview
+    item_quantity_is_int: memoryview
+    item_prices: memoryview
+    item_totals: memoryview
+    discount_products: memoryview
+    discount_descriptions: memoryview
+    discount_amounts: memoryview
+
+
+def _chunk_columns(amount: str) -> list[tuple[str, str]]:
+    """(typecode, row kind) for every column, in file order."""
+    return [
+        ("I", "receipt"), ("I", "receipt"), ("q", "receipt"), ("d", "receipt"),
+        (amount, "receipt"),
+        ("I", "item"), ("d", "item"), ("B", "item"), (amount, "item"), (amount, "item"),
+        ("I", "discount"), ("I", "discount"), (amount, "discount"),
+    ]
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+class ReceiptArchiveWriter:
+    """Streams receipts into an archive file.
+
+    ``target`` is a path or a binary stream opened for writing. Money
+    archives store exact cents and hold only MoneyReceipts; other
+    archives hold only plain Receipts. By default the first receipt
+    written decides which; pass ``money`` to fix it up front. A receipt
+    of the other kind raises ValueError and leaves the archive as it
+    was. Call close(), or use the writer as a context manager, to write
+    the footer.
+    """
+
+    def __init__(
+        self,
+        target: Union[str, os.PathLike, BinaryIO],
+        money: Optional[bool] = None,
+        chunk_size: int = 4096
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if isinstance(target, (str, os.PathLike)):
+            self._stream: BinaryIO = open(target, "wb")
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+        self.money: Optional[bool] = None
+        self.chunk_size: int = chunk_size
+        self._columns: list[array] = []
+        if money is not None:
+            self._set_money(money)
+        self._product_ids: dict[Product, int] = {}
+        self._description_ids: dict[str, int] = {}
+        self._chunks: list[list[int]] = []
+        self._position = 0
+        self.count: int = 0
+        self._write(MAGIC)
+
+    def __enter__(self) -> "ReceiptArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, receipt: Receipt, timestamp: Optional[float] = None) -> None:
+        """Append a receipt, optionally with when it was issued (epoch seconds)."""
+        money = isinstance(receipt, MoneyReceipt)
+        if money is not self.money:
+            if self.money is not None:
+                raise ValueError(
+                    f"cannot write a {type(receipt).__name__} to an archive of "
+                    f"{'Money' if self.money else 'float'} receipts")
+            self._set_money(money)
+        columns = self._columns
+        lengths = [len(column) for column in columns]
+        try:
+            self._append(receipt, timestamp)
+        except BaseException:
+            # Keep every column the same length, so the chunk stays readable.
+            for column, length in zip(columns, lengths):
+                del column[length:]
+            raise
+        self.count += 1
+        if len(columns[0]) >= self.chunk_size:
+            self._flush()
+
+    def _append(self, receipt: Receipt, timestamp: Optional[float]) -> None:
+        columns = self._columns
+        product_ids = self._product_ids
+        items = receipt.item_view
+        discounts = receipt.discount_view
+        columns[0].append(len(items))
+        columns[1].append(len(discounts))
+        version = receipt.offers_version
+        columns[2].append(_NO_VERSION if version is None else version)
+        columns[3].append(math.nan if timestamp is None else timestamp)
+        columns[4].append(receipt.total_price())
+
+        products, quantities, is_int, prices, totals = columns[5:10]
+        for product, quantity, price, total_price in items:
+            product_id = product_ids.get(product)
+            if product_id is None:
+                product_id = product_ids[product] = len(product_ids)
+            products.append(product_id)
+            quantities.append(quantity)
+            is_int.append(type(quantity) is int)
+            prices.append(price)
+            totals.append(total_price)
+
+        description_ids = self._description_ids
+        products, descriptions, amounts = columns[10:13]
+        for product, description, amount in discounts:
+            product_id = product_ids.get(product)
+            if product_id is None:
+                product_id = product_ids[product] = len(product_ids)
+            description_id = description_ids.get(description)
+            if description_id is None:
+                description_id = description_ids[description] = len(description_ids)
+            products.append(product_id)
+            descriptions.append(description_id)
+            amounts.append(amount)
+
+    def close(self) -> None:
+        if self._stream is None:
+            return
+        self._flush()
+        footer = json.dumps({
+            "money": bool(self.money),
+            "receipts": self.count,
+            "products": [[p.name, p.unit.value] for p in self._product_ids],
+            "descriptions": list(self._description_ids),
+            "chunks": self._chunks,
+        }, separators=(",", ":")).encode()
+        footer_offset = self._position
+        self._write(footer)
+        self._write(_TRAILER.pack(footer_offset, END_MAGIC))
+        if self._owns_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+        self._stream = None
+
+    def _set_money(self, money: bool) -> None:
+        self.money = money
+        self._amount = "q" if money else "d"
+        self._new_chunk()
+
+    def _new_chunk(self) -> None:
+        self._columns = [array(code) for code, _ in _chunk_columns(self._amount)]
+
+    def _flush(self) -> None:
+        columns = self._columns
+        receipts = len(columns[0]) if columns else 0
+        if not receipts:
+            return
+        self._chunks.append([self._position, receipts, len(columns[5]), len(columns[10])])
+        self._write(_CHUNK.pack(b"CHNK", receipts, len(columns[5]), len(columns[10])))
+        for column in columns:
+            data = column.tobytes()
+            self._write(data)
+            self._write(bytes(_padding(len(data))))
+        self._new_chunk()
+
+    def _write(self, data: bytes) -> None:
+        self._stream.write(data)
+        self._position += len(data)
+
+
+class ReceiptArchive:
+    """Reads an archive written by ReceiptArchiveWriter through a memory map.
+
+    Iterating yields Receipt objects (MoneyReceipt for Money archives), one
+    chunk at a time. chunks() and scan_totals() read the columns in place
+    without building receipts.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        if (size < len(MAGIC) + _TRAILER.size
+                or self._map[:len(MAGIC)] != MAGIC):
+            self._map.close()
+            raise ValueError(f"{self.path} is not a receipt archive")
+        footer_offset, end_magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if end_magic != END_MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is truncated: the footer is missing")
+        footer = json.loads(self._map[footer_offset:size - _TRAILER.size])
+        self.money: bool = footer["money"]
+        self.products: list[Product] = [
+            Product(name, ProductUnit(unit)) for name, unit in footer["products"]]
+        self.descriptions: list[str] = footer["descriptions"]
+        self._chunks: list[list[int]] = footer["chunks"]
+        self._count: int = footer["receipts"]
+        self._amount = "q" if self.money else "d"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "ReceiptArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Receipt]:
+        for _, receipt in self.records():
+            yield receipt
+
+    def close(self) -> None:
+        self._map.close()
+
+    def chunks(self) -> Iterator[ArchiveChunk]:
+        """The columns of each chunk in turn.
+
+        The views point into the memory map and are released when the
+        iteration moves on, so copy anything that must outlive it.
+        """
+        base = memoryview(self._map)
+        try:
+            for offset, receipts, items, discounts in self._chunks:
+                rows = {"receipt": receipts, "item": items, "discount": discounts}
+                position = offset + _CHUNK.size
+                views = []
+                for code, kind in _chunk_columns(self._amount):
+                    size = array(code).itemsize * rows[kind]
+                    views.append(base[position:position + size].cast(code))
+                    position += size + _padding(size)
+                try:
+                    yield ArchiveChunk(*views)
+                finally:
+                    for view in views:
+                        view.release()
+        finally:
+            base.release()
+
+    def scan_totals(self) -> array:
+        """Every receipt's total, straight from the total columns."""
+        totals = array(self._amount)
+        for chunk in self.chunks():
+            totals.frombytes(chunk.totals.tobytes())
+        return totals
+
+    def records(self) -> Iterator[tuple[Optional[float], Receipt]]:
+        """(timestamp or None, receipt) for every receipt, in write order."""
+        products = self.products
+        descriptions = self.descriptions
+        money = self.money
+        make_receipt = MoneyReceipt if money else Receipt
+        for chunk in self.chunks():
+            item_counts = chunk.receipt_item_counts.tolist()
+            discount_counts = chunk.receipt_discount_counts.tolist()
+            versions = chunk.offers_versions.tolist()
+            timestamps = chunk.timestamps.tolist()
+            item_rows = zip(
+                chunk.item_products.tolist(), chunk.item_quantities.tolist(),
+                chunk.item_quantity_is_int.tolist(), chunk.item_prices.tolist(),
+                chunk.item_totals.tolist())
+            discount_rows = zip(
+                chunk.discount_products.tolist(), chunk.discount_descriptions.tolist(),
+                chunk.discount_amounts.tolist())
+            for n, version in enumerate(versions):
+                receipt = make_receipt()
+                receipt.offers_version = None if version == _NO_VERSION else version
+                for _ in range(item_counts[n]):
+                    product_id, quantity, is_int, price, total_price = next(item_rows)
+                    if is_int:
+                        quantity = int(quantity)
+                    if money:
+                        price, total_price = Money(price), Money(total_price)
+                    receipt.add_product(products[product_id], quantity, price, total_price)
+                for _ in range(discount_counts[n]):
+                    product_id, description_id, amount = next(discount_rows)
+                    if money:
+                        amount = Money(amount)
+                    receipt.add_discount(
+                        Discount(products[product_id], descriptions[description_id], amount))
+                timestamp = timestamps[n]
+                yield (None if timestamp != timestamp else timestamp), receipt
@@ -1,45 +1,105 @@
-from typing import Union
+import time
+from typing import Iterator, Optional, TextIO, Union
+from instrumentation import CheckoutObserver
+from lru import LRUCache, cacheable
 from model_objects import ProductUnit, Discount
 from receipt import Receipt, ReceiptItem
 
 
+# Whitespace runs for every padding a receipt line is likely to need.
+_PADDING: tuple[str, ...] = tuple(" " * n for n in range(256))
+
+
 class ReceiptPrinter:
+    """Renders receipts as fixed-width text.
+
+    Rendered item and discount lines are kept in a bounded LRU keyed by
+    their values, the types of those values and the column width, so
+    repeated lines are formatted once. Pass ``line_cache_size=0`` to turn
+    the cache off. A printer is not meant to be shared between threads.
+    """
 
-    def __init__(self, columns: int = 40) -> None:
+    def __init__(
+        self,
+        columns: int = 40,
+        observer: Optional[CheckoutObserver] = None,
+        line_cache_size: int = 65536
+    ) -> None:
         self.columns: int = columns
+        self.observer: Optional[CheckoutObserver] = observer
+        self.line_cache: Optional[LRUCache] = (
+            LRUCache(line_cache_size) if line_cache_size else None)
 
     def print_receipt(self, receipt: Receipt) -> str:
-        result = ""
-        for item in receipt.items:
-            receipt_item = self.print_receipt_item(item)
-            result += receipt_item
+        if self.observer is None:
+            return "".join(self.iter_receipt_lines(receipt))
+        started = time.perf_counter()
+        text = "".join(self.iter_receipt_lines(receipt))
+        self._report(started, len(text))
+        return text
+
+    def write_receipt(self, receipt: Receipt, stream: TextIO) -> None:
+        """Render the receipt line by line onto a text stream."""
+        write = stream.write
+        if self.observer is None:
+            for line in self.iter_receipt_lines(receipt):
+                write(line)
+            return
+        started = time.perf_counter()
+        chars = 0
+        for line in self.iter_receipt_lines(receipt):
+            write(line)
+            chars += len(line)
+        self._report(started, chars)
+
+    def _report(self, started: float, chars: int) -> None:
+        self.observer.stage("print", time.perf_counter() - started)
+        self.observer.observe("receipt_chars", chars)
+
+    def iter_receipt_lines(self, receipt: Receipt) -> Iterator[str]:
+        for item in receipt.item_view:
+            yield self.print_receipt_item(item)
 
-        for discount in receipt.discounts:
-            discount_presentation = self.print_discount(discount)
-            result += discount_presentation
+        for discount in receipt.discount_view:
+            yield self.print_discount(discount)
 
-        result += "\n"
-        result += self.present_total(receipt)
-        return str(result)
+        yield "\n"
+        yield self.present_total(receipt)
 
     def print_receipt_item(self, item: ReceiptItem) -> str:
+        cache = self.line_cache
+        if cache is None:
+            return self._render_receipt_item(item)
+        # 2 and 2.0 are equal keys but print differently, hence the types.
+        key = (self.columns, item, type(item.quantity), type(item.price),
+               type(item.total_price))
+        line = cache.get(key)
+        if line is None:
+            line = self._render_receipt_item(item)
+            if cacheable(item.quantity, item.price, item.total_price):
+                cache.put(key, line)
+        return line
+
+    def _render_receipt_item(self, item: ReceiptItem) -> str:
         total_price_printed = self.print_price(item.total_price)
         name = item.product.name
         line = self.format_line_with_whitespace(name, total_price_printed)
         if item.quantity != 1:
-            line += f"  {self.print_price(item.price)} * {self.print_quantity(item)}\n"
+            return f"{line}  {self.print_price(item.price)} * {self.print_quantity(item)}\n"
         return line
 
     def format_line_with_whitespace(self, name: str, value: str) -> str:
-        line = name
         whitespace_size = self.columns - len(name) - len(value)
-        line += (" " * whitespace_size)
-        line += value
-        line += "\n"
-        return line
+        if whitespace_size <= 0:
+            return f"{name}{value}\n"
+        if whitespace_size < len(_PADDING):
+            return f"{name}{_PADDING[whitespace_size]}{value}\n"
+        return f"{name}{' ' * whitespace_size}{value}\n"
 
     def print_price(self, price: Union[int, float]) -> str:
-        return "%.2f" % price
+        # format() rather than %, so amount types such as money.Money
+        # can render themselves exactly.
+        return format(price, ".2f")
 
     def print_quantity(self, item: ReceiptItem) -> str:
         if ProductUnit.EACH == item.product.unit:
@@ -48,6 +108,18 @@ class ReceiptPrinter:
             return '%.3f' % item.quantity
 
     def print_discount(self, discount: Discount) -> str:
+        cache = self.line_cache
+        if cache is None:
+            return self._render_discount(discount)
+        key = (self.columns, discount, type(discount.discount_amount))
+        line = cache.get(key)
+        if line is None:
+            line = self._render_discount(discount)
+            if cacheable(discount.discount_amount):
+                cache.put(key, line)
+        return line
+
+    def _render_discount(self, discount: Discount) -> str:
         name = f"{discount.description} ({discount.product.name})"
         value = self.print_price(discount.discount_amount)
         return self.format_line_with_whitespace(name, value)
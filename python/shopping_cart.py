@@ -1,14 +1,20 @@
+import math
+import threading
 from typing import Union, TypeAlias
 from model_objects import Product, ProductQuantity
 
 ProductQuantities: TypeAlias = dict[Product, Union[int, float]]
 
+_make_product_quantity = ProductQuantity._make
+
 
 class ShoppingCart:
+    """A basket of product quantities; writes lock, so check out a changing cart via snapshot()."""
 
     def __init__(self) -> None:
         self._items: list[ProductQuantity] = []
         self._product_quantities: ProductQuantities = {}
+        self._lock = threading.Lock()
 
     @property
     def items(self) -> list[ProductQuantity]:
@@ -28,8 +34,46 @@ class ShoppingCart:
         product: Product,
         quantity: Union[int, float]
     ) -> None:
-        self._items.append(ProductQuantity(product, quantity))
-        if product in self._product_quantities.keys():
-            self._product_quantities[product] += quantity
-        else:
-            self._product_quantities[product] = quantity
+        with self._lock:
+            self._items.append(_make_product_quantity((product, quantity)))
+            quantities = self._product_quantities
+            if product in quantities:
+                quantities[product] += quantity
+            else:
+                quantities[product] = quantity
+
+    def remove_item_quantity(
+        self,
+        product: Product,
+        quantity: Union[int, float]
+    ) -> None:
+        """Void a quantity already in the cart, recorded as a negative line."""
+        if not quantity > 0:
+            raise ValueError(f"quantity to remove must be positive, not {quantity}")
+        with self._lock:
+            quantities = self._product_quantities
+            held = quantities.get(product, 0)
+            # Weighed quantities are float sums, so voiding what is left
+            # may ask for a hair more or less than the sum holds; that
+            # empties the line exactly (held - held keeps held's type).
+            all_of_it = math.isclose(quantity, held)
+            if quantity > held and not all_of_it:
+                raise ValueError(f"cannot remove more {product.name} than the cart holds")
+            self._items.append(_make_product_quantity((product, -quantity)))
+            quantities[product] = held - held if all_of_it else held - quantity
+
+    def snapshot(self) -> "ShoppingCart":
+        """A copy of the cart as it is now, unaffected by later changes."""
+        copy = ShoppingCart()
+        with self._lock:
+            copy._items = self._items[:]
+            copy._product_quantities = self._product_quantities.copy()
+        return copy
+
+    def __getstate__(self) -> tuple[list[ProductQuantity], ProductQuantities]:
+        with self._lock:
+            return self._items[:], self._product_quantities.copy()
+
+    def __setstate__(self, state: tuple[list[ProductQuantity], ProductQuantities]) -> None:
+        self._items, self._product_quantities = state
+        self._lock = threading.Lock()
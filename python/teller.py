@@ -1,30 +1,164 @@
+import functools
+import time
+from typing import NamedTuple
+
+from catalog import unit_prices_of, unit_prices_of_async
 from model_objects import Offer
 from receipt import Receipt
 from offer_handler import OfferHandler
+from offer_index import OfferIndex
+
+
+class _BasketQuantities(NamedTuple):
+    # What a deferred offer pass reads from a cart, copied at checkout.
+    product_quantities: dict
 
 
 class Teller:
+    # The receipt type price_items fills.
+    receipt_class = Receipt
 
-    def __init__(self, catalog):
+    def __init__(self, catalog, observer=None, discount_memo=None):
         self.catalog = catalog
-        self.offers = {}
         self.offer_handler = OfferHandler()
+        # Versioned tables of compiled offers keyed by product name.
+        # Checkout reads the current table once and never locks.
+        self.offer_plans = OfferIndex(self.offer_handler)
+        # An instrumentation.CheckoutObserver; None keeps checkout untimed.
+        self.observer = observer
+        # A discount_memo.DiscountMemo reused across baskets, or None to
+        # work every discount out afresh.
+        self.discount_memo = discount_memo
+
+    @property
+    def offers(self):
+        return self.offer_plans.offers
 
     def add_special_offer(self, offer_type, product, argument):
-        self.offers[product] = Offer(offer_type, product, argument)
+        self.offer_plans.add(Offer(offer_type, product, argument))
 
-    def checks_out_articles_from(self, the_cart):
-        receipt = Receipt()
-        product_quantities = the_cart.items
-        for pq in product_quantities:
-            p = pq.product
-            quantity = pq.quantity
-            unit_price = self.catalog.unit_price(p)
-            price = quantity * unit_price
-            receipt.add_product(p, quantity, unit_price, price)
+    @property
+    def offers_version(self):
+        return self.offer_plans.version
+
+    def replace_offers(self, offers):
+        """Publish a new offers table built from Offers; returns its version."""
+        version = self.offer_plans.replace_all(offers).version
+        if self.discount_memo is not None:
+            self.discount_memo.clear()
+        return version
+
+    def checks_out_articles_from(self, the_cart, lazy=False):
+        """Price a cart; with ``lazy`` the offers wait until the discounts are read."""
+        return self._checkout([the_cart], the_cart.product_quantities.keys(), lazy)[0]
+
+    def checkout_many(self, carts, lazy=False):
+        """Check out carts with one price lookup, returning receipts in input order."""
+        carts = list(carts)
+        return self._checkout(carts, self.products_of(carts), lazy)
+
+    async def checkout_async(self, the_cart, lazy=False):
+        """checks_out_articles_from for a catalog whose lookups are awaitable."""
+        return (await self.checkout_many_async([the_cart], lazy))[0]
+
+    async def checkout_many_async(self, carts, lazy=False):
+        """checkout_many with a single awaited price lookup for the batch."""
+        carts = list(carts)
+        started = time.perf_counter()
+        products = self.products_of(carts)
+        unit_prices = await unit_prices_of_async(self.catalog, products)
+        return self._price_carts(carts, products, unit_prices, lazy, started)
 
-        # Use OfferHandler instead of cart.handle_offers
-        self.offer_handler.apply_offers(
-            the_cart, self.offers, self.catalog, receipt)
+    @staticmethod
+    def products_of(carts):
+        """The distinct products in carts, in first-seen order."""
+        products = {}
+        for cart in carts:
+            products.update(dict.fromkeys(cart.product_quantities))
+        return products.keys()
 
+    def _checkout(self, carts, products, lazy):
+        started = time.perf_counter()
+        # One catalog round trip for every distinct product in the batch,
+        # shared with the offer pass.
+        unit_prices = unit_prices_of(self.catalog, products)
+        return self._price_carts(carts, products, unit_prices, lazy, started)
+
+    def _price_carts(self, carts, products, unit_prices, lazy, started):
+        observer = self.observer
+        clock = time.perf_counter
+        if observer is not None:
+            observer.stage("catalog", clock() - started)
+            observer.count("catalog_calls")
+            observer.count("catalog_products", len(products))
+
+        # The whole batch is priced against one offers table.
+        offer_table = self.offer_plans.table
+        receipts = []
+        for cart in carts:
+            if observer is not None:
+                items_started = clock()
+            receipt = self.price_items(cart, unit_prices)
+            receipt.offers_version = offer_table.version
+            if observer is not None:
+                offers_started = clock()
+            if lazy:
+                self.defer_offers(cart, offer_table, unit_prices, receipt)
+            else:
+                self.offer_handler.apply_offer_index(
+                    cart, offer_table, unit_prices, receipt, self.discount_memo)
+            if observer is not None:
+                self._report(observer, cart, receipt, offer_table, lazy,
+                             offers_started - items_started, clock() - offers_started)
+            receipts.append(receipt)
+
+        if observer is not None:
+            observer.stage("checkout", clock() - started)
+        return receipts
+
+    def defer_offers(self, the_cart, offer_table, unit_prices, receipt):
+        """Run the offer pass on receipt when its discounts are first read."""
+        # The cart may change after checkout, so the offer pass gets a copy
+        # of its quantities. The table is immutable and unit_prices is not
+        # changed once looked up. A partial rather than a closure keeps
+        # the receipt out of a reference cycle with its pending pass.
+        quantities = _BasketQuantities(dict(the_cart.product_quantities))
+        receipt.defer_discounts(functools.partial(
+            self.offer_handler.apply_offer_index, quantities, offer_table, unit_prices,
+            memo=self.discount_memo))
+
+    def price_items(self, the_cart, unit_prices):
+        """A receipt_class receipt of the cart's item lines, before any offers."""
+        receipt = self.receipt_class()
+        line_total = self.line_total
+        for pq in the_cart.items:
+            quantity = pq.quantity
+            unit_price = unit_prices[pq.product]
+            receipt.add_product(pq.product, quantity, unit_price, line_total(quantity, unit_price))
         return receipt
+
+    def line_total(self, quantity, unit_price):
+        """The total of one item line."""
+        return quantity * unit_price
+
+    def amount(self, value):
+        """A sum of line totals and discounts as this teller's amount type."""
+        return value
+
+    @staticmethod
+    def _report(observer, cart, receipt, offer_table, lazy, items_seconds, offers_seconds):
+        observer.stage("items", items_seconds)
+        observer.count("receipts")
+        if lazy:
+            # The offer pass has not run, so there is nothing to report
+            # about offers or the receipt's length yet.
+            observer.count("offers_deferred")
+            return
+        plans = offer_table.plans
+        item_count = len(receipt.item_view)
+        discount_count = len(receipt.discount_view)
+        observer.stage("offers", offers_seconds)
+        observer.count("offers_evaluated",
+                       sum(1 for p in cart.product_quantities if p.name in plans))
+        observer.count("offers_applied", discount_count)
+        observer.observe("receipt_lines", item_count + discount_count)
@@ -0,0 +1,50 @@
+import asyncio
+
+from catalog import AsyncSupermarketCatalog
+
+
+class FakeAsyncCatalog(AsyncSupermarketCatalog):
+    """FakeCatalog behind a simulated network round trip and connection pool.
+
+    Every query holds one of ``pool_size`` connections for ``latency``
+    seconds. With ``bulk`` set, unit_prices is a single query; otherwise
+    it uses the protocol default of one concurrent query per product.
+    """
+
+    def __init__(self, latency=0.0, pool_size=10, bulk=True):
+        self.products = {}
+        self.prices = {}
+        self.latency = latency
+        self.pool_size = pool_size
+        self.bulk = bulk
+        self.queries = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._pool = None
+
+    def add_product(self, product, price):
+        self.products[product.name] = product
+        self.prices[product.name] = price
+
+    async def unit_price(self, product):
+        return (await self._query([product.name]))[0]
+
+    async def unit_prices(self, products):
+        if not self.bulk:
+            return await super().unit_prices(products)
+        products = list(products)
+        prices = await self._query([p.name for p in products])
+        return dict(zip(products, prices))
+
+    async def _query(self, names):
+        if self._pool is None:
+            self._pool = asyncio.Semaphore(self.pool_size)
+        async with self._pool:
+            self.queries += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.latency)
+                return [self.prices[name] for name in names]
+            finally:
+                self.in_flight -= 1
@@ -13,3 +13,16 @@ class FakeCatalog(SupermarketCatalog):
     def unit_price(self, product):
         return self.prices[product.name]
 
+
+class UnitFakeCatalog(SupermarketCatalog):
+    """A FakeCatalog that prices each (name, unit) product separately."""
+
+    def __init__(self):
+        self.prices = {}
+
+    def add_product(self, product, price):
+        self.prices[product] = price
+
+    def unit_price(self, product):
+        return self.prices[product]
+
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from model_objects import Product, ProductUnit, SpecialOfferType
+from receipt import Receipt
+from shopping_cart import ShoppingCart
+from teller import Teller
+from tests.fake_async_catalog import FakeAsyncCatalog
+from .helpers import setup_multiple_products_test
+
+
+def create_async_catalog(catalog, **kwargs):
+    async_catalog = FakeAsyncCatalog(**kwargs)
+    for name, price in catalog.prices.items():
+        async_catalog.add_product(catalog.products[name], price)
+    return async_catalog
+
+
+def test_async_checkout_matches_sync_checkout():
+    catalog, *_, cart, teller = setup_multiple_products_test()
+    expected = teller.checks_out_articles_from(cart)
+    async_catalog = create_async_catalog(catalog)
+    teller.catalog = async_catalog
+
+    receipt = asyncio.run(teller.checkout_async(cart))
+
+    assert expected.items == receipt.items
+    assert expected.discounts == receipt.discounts
+    assert expected.total_price() == receipt.total_price()
+    assert 1 == async_catalog.queries
+
+
+def test_async_checkout_accepts_a_synchronous_catalog():
+    _, *_, cart, teller = setup_multiple_products_test()
+    expected = teller.checks_out_articles_from(cart)
+
+    receipt = asyncio.run(teller.checkout_async(cart))
+
+    assert expected.discounts == receipt.discounts
+
+
+def test_async_checkout_accepts_a_catalog_with_only_an_async_unit_price():
+    catalog, *_, cart, teller = setup_multiple_products_test()
+    expected = teller.checks_out_articles_from(cart)
+
+    class UnitPriceOnlyCatalog:
+        async def unit_price(self, product):
+            return catalog.unit_price(product)
+
+    teller.catalog = UnitPriceOnlyCatalog()
+    receipt = asyncio.run(teller.checkout_async(cart))
+
+    assert expected.total_price() == receipt.total_price()
+
+
+def test_default_unit_prices_queries_concurrently_within_the_pool():
+    catalog = FakeAsyncCatalog(latency=0.01, pool_size=3, bulk=False)
+    products = [Product(f"item-{i}", ProductUnit.EACH) for i in range(9)]
+    for i, product in enumerate(products):
+        catalog.add_product(product, i)
+
+    prices = asyncio.run(catalog.unit_prices(products))
+
+    assert list(range(9)) == [prices[p] for p in products]
+    assert 9 == catalog.queries
+    assert 3 == catalog.peak_in_flight
+
+
+def test_concurrent_baskets_share_the_connection_pool():
+    catalog = FakeAsyncCatalog(latency=0.02, pool_size=5)
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    catalog.add_product(toothbrush, 0.99)
+    teller = Teller(catalog)
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+    carts = []
+    for _ in range(20):
+        cart = ShoppingCart()
+        cart.add_item_quantity(toothbrush, 3)
+        carts.append(cart)
+
+    async def check_out_all():
+        return await asyncio.gather(*(teller.checkout_async(c) for c in carts))
+
+    receipts = asyncio.run(check_out_all())
+
+    assert 20 == len(receipts)
+    assert all(pytest.approx(-0.99) == r.discounts[0].discount_amount for r in receipts)
+    # One query per basket, with the pool full while they overlap.
+    assert 20 == catalog.queries
+    assert 5 == catalog.peak_in_flight
+
+
+def test_checkout_many_async_makes_one_query_for_the_batch():
+    catalog, *_, cart, teller = setup_multiple_products_test()
+    async_catalog = create_async_catalog(catalog)
+    teller.catalog = async_catalog
+
+    receipts = asyncio.run(teller.checkout_many_async([cart, cart, cart]))
+
+    assert 3 == len(receipts)
+    assert 1 == async_catalog.queries
+
+
+def test_apply_offers_async_fetches_only_offered_prices():
+    catalog, toothbrush, *_, cart, teller = setup_multiple_products_test()
+    async_catalog = create_async_catalog(catalog)
+    receipt = Receipt()
+
+    asyncio.run(teller.offer_handler.apply_offers_async(
+        cart, teller.offers, async_catalog, receipt))
+
+    assert 4 == len(receipt.discounts)
+    assert toothbrush == receipt.discounts[0].product
@@ -0,0 +1,29 @@
+import copy
+
+from benchmarks.suite import BENCHMARKS, SCALES, compare, run_suite
+from workload import build_workload
+
+
+def test_workload_is_reproducible_from_the_seed():
+    first = build_workload(seed=7, skus=500, baskets=5, lines=4)
+    second = build_workload(seed=7, skus=500, baskets=5, lines=4)
+
+    assert [c.items for c in first.carts] == [c.items for c in second.carts]
+    assert first.teller.offers == second.teller.offers
+
+
+def test_suite_reports_every_benchmark_and_memory():
+    report = run_suite(dict(SCALES["tiny"], seed=1), repeat=1)
+
+    assert set(BENCHMARKS) | {"memory"} == set(report["results"])
+    assert 250 == report["lines"]
+    assert report["results"]["memory"]["receipt_bytes_per_line"] > 0
+
+
+def test_compare_flags_slowdowns_beyond_the_tolerance():
+    baseline = run_suite(dict(SCALES["tiny"], seed=1), repeat=1, names=["checkout"])
+    slower = copy.deepcopy(baseline)
+    slower["results"]["checkout"]["lines_per_second"] *= 0.5
+
+    assert [] == compare(baseline, baseline, tolerance=0.25)
+    assert 1 == len(compare(slower, baseline, tolerance=0.25))
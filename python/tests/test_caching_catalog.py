@@ -0,0 +1,111 @@
+from caching_catalog import CachingCatalog
+from model_objects import Product, ProductUnit, SpecialOfferType
+from shopping_cart import ShoppingCart
+from teller import Teller
+from tests.fake_catalog import FakeCatalog, UnitFakeCatalog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingCatalog(FakeCatalog):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def unit_price(self, product):
+        self.lookups += 1
+        return super().unit_price(product)
+
+
+def create_caching_catalog(maxsize=16, ttl=60.0):
+    backing = CountingCatalog()
+    clock = FakeClock()
+    catalog = CachingCatalog(backing, maxsize=maxsize, ttl=ttl, clock=clock)
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    apples = Product("apples", ProductUnit.KILO)
+    catalog.add_product(toothbrush, 0.99)
+    catalog.add_product(apples, 1.99)
+    return backing, clock, catalog, toothbrush, apples
+
+
+def test_repeated_lookups_hit_the_cache():
+    backing, _, catalog, toothbrush, _ = create_caching_catalog()
+
+    assert 0.99 == catalog.unit_price(toothbrush)
+    assert 0.99 == catalog.unit_price(toothbrush)
+
+    assert 1 == backing.lookups
+    assert 1 == catalog.hits
+    assert 1 == catalog.misses
+
+
+def test_entries_expire_after_ttl():
+    backing, clock, catalog, toothbrush, _ = create_caching_catalog(ttl=60.0)
+    catalog.unit_price(toothbrush)
+    backing.prices["toothbrush"] = 1.09
+
+    clock.now = 59.9
+    assert 0.99 == catalog.unit_price(toothbrush)
+    clock.now = 60.0
+    assert 1.09 == catalog.unit_price(toothbrush)
+
+    assert 1 == catalog.expirations
+    assert 2 == backing.lookups
+
+
+def test_add_product_invalidates_cached_price():
+    _, _, catalog, toothbrush, _ = create_caching_catalog()
+    catalog.unit_price(toothbrush)
+
+    catalog.add_product(toothbrush, 1.49)
+
+    assert 1.49 == catalog.unit_price(toothbrush)
+
+
+def test_products_sharing_a_name_are_cached_apart():
+    catalog = CachingCatalog(UnitFakeCatalog(), clock=FakeClock())
+    rice_each = Product("rice", ProductUnit.EACH)
+    rice_kilo = Product("rice", ProductUnit.KILO)
+    catalog.add_product(rice_each, 1.0)
+    catalog.add_product(rice_kilo, 2.5)
+
+    assert {rice_each: 1.0, rice_kilo: 2.5} == catalog.unit_prices(
+        [rice_each, rice_kilo])
+    assert {rice_each: 1.0, rice_kilo: 2.5} == catalog.unit_prices(
+        [rice_each, rice_kilo])
+    assert 2 == catalog.hits
+
+    catalog.add_product(rice_kilo, 2.75)
+
+    assert 1.0 == catalog.unit_price(rice_each)
+    assert 2.75 == catalog.unit_price(rice_kilo)
+
+
+def test_least_recently_used_entry_is_evicted():
+    backing, _, catalog, toothbrush, apples = create_caching_catalog(maxsize=1)
+    catalog.unit_price(toothbrush)
+    catalog.unit_price(apples)
+    catalog.unit_price(toothbrush)
+
+    assert 3 == backing.lookups
+    assert 2 == catalog.evictions
+
+
+def test_teller_uses_caching_catalog_unchanged():
+    backing, _, catalog, toothbrush, _ = create_caching_catalog()
+    teller = Teller(catalog)
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+    cart = ShoppingCart()
+    cart.add_item_quantity(toothbrush, 3)
+
+    first = teller.checks_out_articles_from(cart)
+    second = teller.checks_out_articles_from(cart)
+
+    assert first.total_price() == second.total_price()
+    assert 1 == backing.lookups
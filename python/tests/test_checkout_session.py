@@ -0,0 +1,103 @@
+import pytest
+
+from checkout_session import CheckoutSession
+from workload import receipt_rows
+from .helpers import setup_multiple_products_test
+
+
+def test_running_total_follows_every_scan():
+    _, toothbrush, apples, milk, bread, soap, _, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+
+    session.add_item(toothbrush)
+    session.add_item(toothbrush)
+    assert 2 == session.total_price()
+
+    session.add_item(toothbrush)
+    assert 2 == session.total_price()
+    assert 3 == session.subtotal
+    assert 1 == len(session.discounts)
+
+    session.add_item_quantity(milk, 2)
+    assert 4.5 == session.total_price()
+
+
+def test_session_receipt_matches_full_checkout():
+    _, toothbrush, apples, milk, bread, soap, _, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+    for product, quantity in [
+        (soap, 1), (bread, 3), (toothbrush, 2), (apples, 1.25),
+        (bread, 2), (toothbrush, 1), (milk, 3), (apples, 0.5),
+    ]:
+        session.add_item_quantity(product, quantity)
+        expected = teller.checks_out_articles_from(session.cart)
+        assert receipt_rows(expected) == receipt_rows(session.receipt())
+        assert expected.total_price() == session.total_price()
+
+
+def test_removing_items_recomputes_only_that_offer():
+    _, toothbrush, _, milk, _, _, _, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+    session.add_item_quantity(toothbrush, 3)
+    session.add_item_quantity(milk, 2)
+
+    session.remove_item_quantity(toothbrush, 1)
+
+    assert ["2 for 2.5"] == [d.description for d in session.discounts]
+    expected = teller.checks_out_articles_from(session.cart)
+    assert receipt_rows(expected) == receipt_rows(session.receipt())
+
+
+def test_cannot_remove_more_than_was_scanned():
+    _, toothbrush, _, _, _, _, _, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+    session.add_item_quantity(toothbrush, 1)
+
+    with pytest.raises(ValueError):
+        session.remove_item_quantity(toothbrush, 2)
+
+
+@pytest.mark.parametrize("quantity", [0, -5, float("nan")])
+def test_only_positive_quantities_can_be_removed(quantity):
+    _, toothbrush, _, _, _, _, _, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+    session.add_item_quantity(toothbrush, 1)
+
+    with pytest.raises(ValueError):
+        session.remove_item_quantity(toothbrush, quantity)
+    assert {toothbrush: 1} == session.cart.product_quantities
+    assert 1 == len(session.cart.items)
+
+
+def test_weighed_items_can_be_voided_down_to_nothing():
+    _, _, apples, _, _, _, _, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+    session.add_item_quantity(apples, 0.3)
+
+    for _ in range(3):
+        session.remove_item_quantity(apples, 0.1)
+
+    assert {apples: 0.0} == session.cart.product_quantities
+    assert [] == session.discounts
+    with pytest.raises(ValueError):
+        session.remove_item_quantity(apples, 0.1)
+
+
+def test_session_can_resume_an_existing_cart():
+    *_, cart, teller = setup_multiple_products_test()
+
+    session = CheckoutSession(teller, cart)
+
+    assert receipt_rows(teller.checks_out_articles_from(cart)) == receipt_rows(session.receipt())
+
+
+def test_session_keeps_the_offers_table_it_started_with():
+    *_, cart, teller = setup_multiple_products_test()
+    session = CheckoutSession(teller)
+    teller.replace_offers([])
+
+    for pq in cart.items:
+        session.add_item_quantity(pq.product, pq.quantity)
+
+    assert 4 == len(session.discounts)
+    assert 4 == session.receipt().offers_version
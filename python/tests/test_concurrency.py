@@ -0,0 +1,44 @@
+import threading
+
+from benchmarks.stress import run_stress
+from model_objects import Product, ProductUnit
+from shopping_cart import ShoppingCart
+
+
+def test_shared_teller_under_threads_matches_serial_checkout():
+    report = run_stress(threads=4, baskets=100, lines=5, skus=200, scans_per_thread=500)
+
+    assert 400 == report.checkouts
+    assert 0 == report.mismatches
+    assert 0 == report.cart_errors
+
+
+def test_concurrent_scans_are_all_counted():
+    cart = ShoppingCart()
+    apples = Product("apples", ProductUnit.EACH)
+
+    def scan():
+        for _ in range(1000):
+            cart.add_item_quantity(apples, 1)
+
+    threads = [threading.Thread(target=scan) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 4000 == cart.product_quantities[apples]
+    assert 4000 == len(cart.items)
+
+
+def test_snapshot_is_unaffected_by_later_scans():
+    cart = ShoppingCart()
+    apples = Product("apples", ProductUnit.EACH)
+    cart.add_item_quantity(apples, 2)
+
+    snapshot = cart.snapshot()
+    cart.add_item_quantity(apples, 3)
+    cart.remove_item_quantity(apples, 1)
+
+    assert {apples: 2} == snapshot.product_quantities
+    assert 1 == len(snapshot.items)
@@ -0,0 +1,134 @@
+import math
+import threading
+
+import pytest
+
+from discount_memo import DiscountMemo
+from model_objects import Offer, Product, ProductUnit, SpecialOfferType
+from money import MoneyTeller
+from offer_handler import OfferHandler
+from offer_index import OfferTable
+from shopping_cart import ShoppingCart
+from teller import Teller
+from tests.fake_catalog import FakeCatalog
+from workload import build_workload
+
+
+def discount_rows(receipt):
+    return [(d.product, d.description, d.discount_amount, type(d.discount_amount))
+            for d in receipt.discounts]
+
+
+def memo_teller(teller_class, workload, memo):
+    teller = teller_class(workload.catalog, discount_memo=memo)
+    teller.replace_offers(workload.teller.offer_plans.table.offers.values())
+    return teller
+
+
+@pytest.mark.parametrize("teller_class", [Teller, MoneyTeller])
+def test_memoized_checkout_matches_working_every_discount_out(teller_class):
+    workload = build_workload(seed=3, skus=200, baskets=300, lines=8)
+    plain = memo_teller(teller_class, workload, None)
+    memo = DiscountMemo()
+    memoized = memo_teller(teller_class, workload, memo)
+    expected = [discount_rows(r) for r in plain.checkout_many(workload.carts)]
+
+    for _ in range(2):
+        receipts = memoized.checkout_many(workload.carts)
+        assert expected == [discount_rows(r) for r in receipts]
+    assert memo.hits > memo.misses
+    assert 0 < memo.hit_rate() < 1
+
+
+def test_quantity_and_price_types_are_part_of_the_key():
+    rice = Product("rice", ProductUnit.EACH)
+    plan = OfferHandler().compile_offer(Offer(SpecialOfferType.TWO_FOR_AMOUNT, rice, 1))
+    table = OfferTable(1, {}, {"rice": plan})
+    memo = DiscountMemo()
+
+    for quantity, unit_price in [(2, 1), (2.0, 1), (2, 1.0), (2.0, 1.0), (2, 1)]:
+        cart = ShoppingCart()
+        cart.add_item_quantity(rice, quantity)
+        [(_, _, amount)] = memo.discounts(table.matches(cart), {rice: unit_price})
+        wanted = plan.calculate_discount(quantity, unit_price, 1, 2)
+        assert (wanted, type(wanted)) == (amount, type(amount))
+    assert 4 == len(memo)
+    assert 1 == memo.hits
+
+
+def test_changed_prices_and_offers_are_never_served_stale():
+    catalog = FakeCatalog()
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    catalog.add_product(toothbrush, 0.99)
+    teller = Teller(catalog, discount_memo=DiscountMemo())
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+    cart = ShoppingCart()
+    cart.add_item_quantity(toothbrush, 3)
+
+    [discount] = teller.checks_out_articles_from(cart).discounts
+    assert pytest.approx(-0.99) == discount.discount_amount
+    catalog.add_product(toothbrush, 1.5)
+    [discount] = teller.checks_out_articles_from(cart).discounts
+    assert -1.5 == discount.discount_amount
+    teller.add_special_offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, toothbrush, 10.0)
+    [discount] = teller.checks_out_articles_from(cart).discounts
+    assert ("10.0% off", pytest.approx(-0.45)) == (discount.description, discount.discount_amount)
+
+
+def test_replacing_the_offers_clears_the_memo():
+    workload = build_workload(seed=1, skus=100, baskets=20, lines=5)
+    memo = DiscountMemo()
+    teller = memo_teller(Teller, workload, memo)
+    teller.checkout_many(workload.carts)
+    assert len(memo)
+
+    teller.replace_offers([])
+
+    assert 0 == len(memo)
+
+
+def test_memo_stays_within_maxsize():
+    workload = build_workload(seed=2, skus=1000, baskets=500, lines=10, hot_share=0)
+    memo = DiscountMemo(maxsize=50)
+    memo_teller(Teller, workload, memo).checkout_many(workload.carts)
+
+    assert len(memo) <= 50
+    assert memo.evictions > 0
+
+
+@pytest.mark.parametrize("quantity", [0, 0.0, -0.0, math.nan])
+def test_zero_and_nan_quantities_are_not_stored(quantity):
+    rice = Product("rice", ProductUnit.KILO)
+    table = OfferTable(1, {}, {"rice": OfferHandler().compile_offer(
+        Offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, rice, 10.0))})
+    cart = ShoppingCart()
+    cart.add_item_quantity(rice, quantity)
+    memo = DiscountMemo()
+
+    memo.discounts(table.matches(cart), {rice: 2.0})
+
+    assert 0 == len(memo)
+
+
+def test_threads_sharing_a_memo_get_the_serial_receipts():
+    workload = build_workload(seed=4, skus=300, baskets=200, lines=8)
+    expected = [discount_rows(r) for r in workload.teller.checkout_many(workload.carts)]
+    memo = DiscountMemo(maxsize=64)
+    teller = memo_teller(Teller, workload, memo)
+    failures = []
+
+    def check_out():
+        for _ in range(3):
+            receipts = teller.checkout_many(workload.carts)
+            if expected != [discount_rows(r) for r in receipts]:
+                failures.append(receipts)
+
+    threads = [threading.Thread(target=check_out) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = sum(len(teller.offer_plans.matches(cart)) for cart in workload.carts)
+    assert [] == failures
+    assert 4 * 3 * lines == memo.hits + memo.misses
@@ -0,0 +1,111 @@
+import io
+
+from instrumentation import CheckoutObserver, Histogram, MetricsAggregator
+from receipt_printer import ReceiptPrinter
+from .helpers import setup_multiple_products_test
+
+
+def test_observed_checkout_matches_unobserved_checkout():
+    _, _, _, _, _, _, cart, teller = setup_multiple_products_test()
+    expected = teller.checks_out_articles_from(cart)
+
+    teller.observer = CheckoutObserver()
+    receipt = teller.checks_out_articles_from(cart)
+
+    assert expected.items == receipt.items
+    assert expected.discounts == receipt.discounts
+    assert expected.total_price() == receipt.total_price()
+
+
+def test_aggregator_records_stages_and_counts():
+    _, _, _, _, _, _, cart, teller = setup_multiple_products_test()
+    metrics = MetricsAggregator()
+    teller.observer = metrics
+
+    receipt = teller.checks_out_articles_from(cart)
+    ReceiptPrinter(observer=metrics).print_receipt(receipt)
+
+    assert {"catalog", "items", "offers", "checkout", "print"} == set(metrics.stages)
+    assert 1 == metrics.counters["catalog_calls"]
+    assert 5 == metrics.counters["catalog_products"]
+    assert 4 == metrics.counters["offers_evaluated"]
+    assert 4 == metrics.counters["offers_applied"]
+    assert 9 == metrics.distributions["receipt_lines"].sum
+    assert 1 == metrics.distributions["receipt_chars"].count
+
+
+def test_checkout_many_times_the_catalog_once_per_batch():
+    _, _, _, _, _, _, cart, teller = setup_multiple_products_test()
+    metrics = MetricsAggregator()
+    teller.observer = metrics
+
+    teller.checkout_many([cart, cart, cart])
+
+    assert 1 == metrics.counters["catalog_calls"]
+    assert 1 == metrics.stages["catalog"].count
+    assert 3 == metrics.stages["offers"].count
+    assert 3 == metrics.counters["receipts"]
+
+
+def test_single_and_batch_checkouts_report_the_same_events():
+    _, _, _, _, _, _, cart, teller = setup_multiple_products_test()
+    single, batch = MetricsAggregator(), MetricsAggregator()
+
+    teller.observer = single
+    teller.checks_out_articles_from(cart)
+    teller.observer = batch
+    teller.checkout_many([cart])
+
+    assert batch.counters == single.counters
+    assert set(batch.stages) == set(single.stages)
+
+
+def test_streamed_receipts_are_observed_like_printed_ones():
+    _, _, _, _, _, _, cart, teller = setup_multiple_products_test()
+    receipt = teller.checks_out_articles_from(cart)
+    metrics = MetricsAggregator()
+    printer = ReceiptPrinter(observer=metrics)
+    stream = io.StringIO()
+
+    printer.write_receipt(receipt, stream)
+    text = printer.print_receipt(receipt)
+
+    assert text == stream.getvalue()
+    assert 2 == metrics.stages["print"].count
+    assert 2 * len(text) == metrics.distributions["receipt_chars"].sum
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram([1, 5])
+    for value in (0.5, 1, 3, 7):
+        histogram.add(value)
+
+    assert [("1.0", 2), ("5.0", 3), ("+Inf", 4)] == histogram.cumulative()
+    assert 11.5 == histogram.sum
+
+
+def test_prometheus_export(tmp_path):
+    metrics = MetricsAggregator(seconds_buckets=[0.1], size_buckets=[10])
+    metrics.stage("offers", 0.05)
+    metrics.count("offers_applied", 2)
+    metrics.observe("receipt_lines", 12)
+
+    path = tmp_path / "supermarket.prom"
+    metrics.write_prometheus(str(path))
+
+    assert path.read_text() == (
+        "# HELP supermarket_stage_seconds Wall time spent in each checkout stage.\n"
+        "# TYPE supermarket_stage_seconds histogram\n"
+        'supermarket_stage_seconds_bucket{stage="offers",le="0.1"} 1\n'
+        'supermarket_stage_seconds_bucket{stage="offers",le="+Inf"} 1\n'
+        'supermarket_stage_seconds_sum{stage="offers"} 0.05\n'
+        'supermarket_stage_seconds_count{stage="offers"} 1\n'
+        "# TYPE supermarket_offers_applied_total counter\n"
+        "supermarket_offers_applied_total 2\n"
+        "# TYPE supermarket_receipt_lines histogram\n"
+        'supermarket_receipt_lines_bucket{le="10.0"} 0\n'
+        'supermarket_receipt_lines_bucket{le="+Inf"} 1\n'
+        "supermarket_receipt_lines_sum 12.0\n"
+        "supermarket_receipt_lines_count 1\n"
+    )
+    assert [path.name] == [p.name for p in tmp_path.iterdir()]
@@ -0,0 +1,70 @@
+import pickle
+
+import pytest
+
+from mmap_catalog import MmapCatalog, write_catalog_snapshot
+from model_objects import Product, ProductUnit, SpecialOfferType
+from shopping_cart import ShoppingCart
+from teller import Teller
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "catalog.bin"
+    write_catalog_snapshot(path, [
+        (Product("toothbrush", ProductUnit.EACH), 0.99),
+        (Product("apples", ProductUnit.KILO), 1.99),
+        (Product("rice", ProductUnit.EACH), 2.49),
+        (Product("rice", ProductUnit.EACH), 2.59),
+        (Product("crème fraîche", ProductUnit.EACH), 1.15),
+    ])
+    return path
+
+
+def test_prices_and_products_are_read_from_the_snapshot(snapshot_path):
+    with MmapCatalog(snapshot_path) as catalog:
+        assert 4 == len(catalog)
+        assert 0.99 == catalog.unit_price(Product("toothbrush", ProductUnit.EACH))
+        assert 2.59 == catalog.unit_price(Product("rice", ProductUnit.EACH))
+        assert 1.15 == catalog.unit_price(Product("crème fraîche", ProductUnit.EACH))
+        assert Product("apples", ProductUnit.KILO) is catalog.product_with_name("apples")
+        assert catalog.product_with_name("bananas") is None
+
+
+def test_unknown_product_raises_key_error(snapshot_path):
+    with MmapCatalog(snapshot_path) as catalog:
+        with pytest.raises(KeyError):
+            catalog.unit_price(Product("bananas", ProductUnit.KILO))
+
+
+def test_snapshot_is_read_only(snapshot_path):
+    with MmapCatalog(snapshot_path) as catalog:
+        with pytest.raises(Exception):
+            catalog.add_product(Product("bananas", ProductUnit.KILO), 1.0)
+
+
+def test_pickled_catalog_maps_the_same_file(snapshot_path):
+    with MmapCatalog(snapshot_path) as catalog:
+        copy = pickle.loads(pickle.dumps(catalog))
+        assert snapshot_path == type(snapshot_path)(copy.path)
+        assert 1.99 == copy.unit_price(Product("apples", ProductUnit.KILO))
+        copy.close()
+
+
+def test_teller_checks_out_against_the_snapshot(snapshot_path):
+    with MmapCatalog(snapshot_path) as catalog:
+        toothbrush = catalog.product_with_name("toothbrush")
+        teller = Teller(catalog)
+        teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+        cart = ShoppingCart()
+        cart.add_item_quantity(toothbrush, 3)
+
+        assert 0.99 * 3 - 0.99 == pytest.approx(teller.checks_out_articles_from(cart).total_price())
+
+
+def test_files_without_the_magic_header_are_rejected(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_bytes(b"name,unit,price\n" + b" " * 32)
+
+    with pytest.raises(ValueError):
+        MmapCatalog(path)
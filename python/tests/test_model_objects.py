@@ -0,0 +1,45 @@
+import pickle
+
+import pytest
+
+from model_objects import Discount, Product, ProductQuantity, ProductUnit
+from receipt import ReceiptItem
+
+
+def test_products_are_interned_by_name_and_unit():
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+
+    assert toothbrush is Product("toothbrush", ProductUnit.EACH)
+    assert toothbrush == Product("toothbrush", ProductUnit.EACH)
+    assert toothbrush != Product("toothbrush", ProductUnit.KILO)
+    assert hash(toothbrush) == hash(Product("toothbrush", ProductUnit.EACH))
+
+
+def test_unpickled_product_is_the_interned_instance():
+    apples = Product("apples", ProductUnit.KILO)
+
+    assert apples is pickle.loads(pickle.dumps(apples))
+
+
+def test_rebuilt_product_finds_offers_keyed_by_the_original():
+    offers = {Product("rice", ProductUnit.EACH): "10% off"}
+
+    assert "10% off" == offers.get(Product("rice", ProductUnit.EACH))
+
+
+@pytest.mark.parametrize("value, attribute", [
+    (Product("milk", ProductUnit.EACH), "name"),
+    (ProductQuantity(Product("milk", ProductUnit.EACH), 2), "quantity"),
+    (ReceiptItem(Product("milk", ProductUnit.EACH), 2, 1.5, 3.0), "total_price"),
+    (Discount(Product("milk", ProductUnit.EACH), "2 for 2.5", -0.5), "discount_amount"),
+])
+def test_value_objects_are_immutable(value, attribute):
+    with pytest.raises(AttributeError):
+        setattr(value, attribute, None)
+
+
+def test_value_objects_compare_by_value():
+    milk = Product("milk", ProductUnit.EACH)
+
+    assert ReceiptItem(milk, 2, 1.5, 3.0) == ReceiptItem(milk, 2, 1.5, 3.0)
+    assert Discount(milk, "2 for 2.5", -0.5) == Discount(milk, "2 for 2.5", -0.5)
@@ -0,0 +1,122 @@
+import asyncio
+from fractions import Fraction
+
+import pytest
+
+from model_objects import Product, ProductUnit, SpecialOfferType
+from checkout_session import CheckoutSession
+from money import Money, MoneyReceipt, MoneyTeller, line_total
+from receipt_printer import ReceiptPrinter
+from shopping_cart import ShoppingCart
+from tests.fake_async_catalog import FakeAsyncCatalog
+from tests.fake_catalog import FakeCatalog
+from .helpers import setup_multiple_products_test
+from .test_receipt_printer import EXPECTED_RECEIPT
+
+
+@pytest.mark.parametrize("amount, cents", [
+    (0.99, 99), (1.995, 200), (0.005, 1), (-0.005, -1), (2, 200), ("7.49", 749),
+])
+def test_amounts_round_half_away_from_zero(amount, cents):
+    assert cents == Money.from_amount(amount)
+
+
+def test_fractional_cents_round_half_away_from_zero():
+    assert [Money(1129), Money(-1), Money(1189)] == [
+        Money.from_cents(1128.5), Money.from_cents(-0.5), Money.from_cents(Fraction(4755, 4))]
+
+
+def test_money_prints_without_going_through_float():
+    assert "1.60" == str(Money(160))
+    assert "-0.05" == str(Money(-5))
+    assert "0.00" == str(Money(0))
+    assert "90071992547409.93" == str(Money(2 ** 53 + 1))
+
+
+@pytest.mark.parametrize("spec, text", [
+    ("", "-1234.56"), (".2f", "-1234.56"), (".3f", "-1234.560"), ("10.2f", "  -1234.56"),
+    (">10", "  -1234.56"), (",.2f", "-1,234.56"), ("+.0f", "-1235"),
+])
+def test_money_formats_in_major_units_for_any_spec(spec, text):
+    assert text == format(Money(-123456), spec)
+    assert text == f"{Money(-123456):{spec}}"
+
+
+def test_weighed_line_total_is_rounded_once():
+    assert Money(299) == line_total(1.5, Money(199))
+    assert Money(498) == line_total(2.5, Money(199))
+    assert Money(597) == line_total(3, Money(199))
+
+
+def test_money_checkout_prints_the_same_receipt():
+    catalog, *_, cart, _ = setup_multiple_products_test()
+    _, toothbrush, apples, milk, bread, _, _, float_teller = setup_multiple_products_test()
+    teller = MoneyTeller(catalog)
+    for product, offer in float_teller.offers.items():
+        teller.add_special_offer(offer.offer_type, product, offer.argument)
+
+    receipt = teller.checks_out_articles_from(cart)
+
+    assert Money(1260) == receipt.total_price()
+    assert isinstance(receipt.total_price(), Money)
+    assert all(isinstance(d.discount_amount, Money) for d in receipt.discounts)
+    assert EXPECTED_RECEIPT == ReceiptPrinter().print_receipt(receipt)
+
+
+def test_money_totals_do_not_drift():
+    catalog = FakeCatalog()
+    sweets = Product("sweets", ProductUnit.EACH)
+    catalog.add_product(sweets, 0.1)
+    teller = MoneyTeller(catalog)
+    teller.add_special_offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, sweets, 10.0)
+    cart = ShoppingCart()
+    for _ in range(10):
+        cart.add_item(sweets)
+
+    receipt = teller.checks_out_articles_from(cart)
+
+    assert Money(90) == receipt.total_price()
+    assert "0.90" == ReceiptPrinter().print_price(receipt.total_price())
+
+
+def weighed_basket(catalog):
+    rice = Product("rice", ProductUnit.KILO)
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    catalog.add_product(rice, 1.99)
+    catalog.add_product(toothbrush, 0.99)
+    teller = MoneyTeller(catalog)
+    teller.add_special_offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, rice, 10.0)
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+    cart = ShoppingCart()
+    cart.add_item_quantity(rice, 2.5)
+    for _ in range(3):
+        cart.add_item(toothbrush)
+    return teller, cart
+
+
+def assert_money_receipt(receipt):
+    assert isinstance(receipt, MoneyReceipt)
+    assert Money(646) == receipt.total_price()
+    assert all(isinstance(i.total_price, Money) for i in receipt.items)
+    assert all(isinstance(d.discount_amount, Money) for d in receipt.discounts)
+
+
+def test_money_session_matches_checkout():
+    teller, cart = weighed_basket(FakeCatalog())
+    expected = teller.checks_out_articles_from(cart)
+
+    session = CheckoutSession(teller, cart)
+
+    assert_money_receipt(session.receipt())
+    assert expected.items == session.receipt().items
+    assert Money(646) == session.total_price()
+    assert (Money(795), "7.95") == (session.subtotal, str(session.subtotal))
+
+
+def test_money_async_checkout_matches_checkout():
+    teller, cart = weighed_basket(FakeAsyncCatalog())
+
+    receipt = asyncio.run(teller.checkout_async(cart))
+
+    assert_money_receipt(receipt)
+    assert "6.46" == ReceiptPrinter().print_price(receipt.total_price())
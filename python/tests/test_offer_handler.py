@@ -42,3 +42,35 @@ def test_zero_quantity():
     offer_handler.apply_offers(cart, offers, catalog, receipt)
 
     assert len(receipt.discounts) == 0
+
+
+def test_compile_offer_prerenders_description():
+    _, toothbrush = create_catalog_with_product(
+        "toothbrush", ProductUnit.EACH, 1, 1
+    )
+    offer_handler = OfferHandler()
+
+    plan = offer_handler.compile_offer(
+        Offer(SpecialOfferType.TWO_FOR_AMOUNT, toothbrush, 1.5))
+
+    assert "2 for 1.5" == plan.description
+    assert 2 == plan.offer_amount
+    assert -0.5 == plan.calculate_discount(2, 1, plan.argument, plan.offer_amount)
+
+
+def test_apply_offer_plans_matches_apply_offers():
+    catalog, toothbrush = create_catalog_with_product(
+        "toothbrush", ProductUnit.EACH, 0.99, 1
+    )
+    cart = ShoppingCart()
+    cart.add_item_quantity(toothbrush, 7)
+    offers = {toothbrush: Offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)}
+    offer_handler = OfferHandler()
+
+    from_offers = Receipt()
+    offer_handler.apply_offers(cart, offers, catalog, from_offers)
+    from_plans = Receipt()
+    offer_handler.apply_offer_plans(
+        cart, offer_handler.compile_offers(offers), {toothbrush: 0.99}, from_plans)
+
+    assert from_offers.discounts == from_plans.discounts
@@ -0,0 +1,184 @@
+import threading
+
+import pytest
+
+from model_objects import Offer, Product, ProductUnit, SpecialOfferType
+from offer_handler import OfferHandler
+from offer_index import OfferIndex
+from shopping_cart import ShoppingCart
+from .helpers import setup_multiple_products_test
+
+
+def create_products(count):
+    return [Product(f"sku-{i}", ProductUnit.EACH) for i in range(count)]
+
+
+def test_offers_are_found_by_product_name():
+    index = OfferIndex(OfferHandler())
+    each = Product("rice", ProductUnit.EACH)
+    kilo = Product("rice", ProductUnit.KILO)
+    index.add(Offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, each, 10.0))
+
+    assert kilo in index
+    assert "10.0% off" == index.get(kilo).description
+
+
+def test_small_cart_against_a_large_table():
+    products = create_products(1000)
+    index = OfferIndex(OfferHandler(), [
+        Offer(SpecialOfferType.THREE_FOR_TWO, p, 0) for p in products])
+    cart = ShoppingCart()
+    cart.add_item_quantity(products[500], 3)
+    cart.add_item_quantity(Product("unoffered", ProductUnit.EACH), 1)
+    cart.add_item_quantity(products[7], 1)
+
+    assert [products[500], products[7]] == [p for p, _, _ in index.matches(cart)]
+
+
+def test_large_cart_against_a_small_table_keeps_cart_order():
+    products = create_products(100)
+    index = OfferIndex(OfferHandler(), [
+        Offer(SpecialOfferType.THREE_FOR_TWO, products[90], 0),
+        Offer(SpecialOfferType.THREE_FOR_TWO, products[10], 0),
+    ])
+    cart = ShoppingCart()
+    for product in products:
+        cart.add_item_quantity(product, 2)
+
+    matches = index.matches(cart)
+
+    assert [(products[10], 2), (products[90], 2)] == [(p, q) for p, q, _ in matches]
+
+
+@pytest.mark.parametrize("others", [0, 5], ids=["walks the cart", "walks the table"])
+def test_both_matching_strategies_match_by_name(others):
+    each = Product("rice", ProductUnit.EACH)
+    kilo = Product("rice", ProductUnit.KILO)
+    index = OfferIndex(OfferHandler(), [
+        Offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, each, 10.0)])
+    cart = ShoppingCart()
+    for product in create_products(others):
+        cart.add_item_quantity(product, 1)
+    cart.add_item_quantity(kilo, 1.5)
+
+    assert [(kilo, 1.5)] == [(p, q) for p, q, _ in index.matches(cart)]
+
+
+def test_teller_offers_are_a_read_only_view():
+    *_, cart, teller = setup_multiple_products_test()
+    offers = teller.offers
+    toothbrush = next(iter(offers))
+
+    with pytest.raises(TypeError):
+        offers[toothbrush] = Offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+
+    assert teller.offers is teller.offers
+    assert SpecialOfferType.THREE_FOR_TWO == teller.offers[toothbrush].offer_type
+
+
+def test_writes_publish_one_table_on_the_next_read():
+    products = create_products(3)
+    index = OfferIndex(OfferHandler())
+    empty = index.table
+
+    for product in products:
+        index.add(Offer(SpecialOfferType.THREE_FOR_TWO, product, 0))
+    index.remove(products[1])
+    table = index.table
+
+    assert 4 == index.version == table.version
+    assert {products[0].name, products[2].name} == set(table.plans)
+    assert table is index.table
+    assert (0, {}) == (empty.version, empty.plans)
+
+
+def test_replace_all_swaps_the_whole_table():
+    toothbrush, rice = create_products(2)
+    index = OfferIndex(OfferHandler(), [
+        Offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)])
+    old_table = index.table
+
+    index.replace_all([Offer(SpecialOfferType.TWO_FOR_AMOUNT, rice, 1.5)])
+
+    assert toothbrush not in index
+    assert "2 for 1.5" == index.get(rice).description
+    assert {rice} == set(index.offers)
+    assert toothbrush.name in old_table.offers and 1 == old_table.version
+    assert 2 == index.version
+
+
+def test_teller_replace_offers_matches_adding_them_one_by_one():
+    _, *_, cart, teller = setup_multiple_products_test()
+    expected = teller.checks_out_articles_from(cart)
+    offers = list(teller.offers.values())
+
+    teller.replace_offers([])
+    assert [] == teller.checks_out_articles_from(cart).discounts
+
+    teller.replace_offers(offers)
+    assert expected.discounts == teller.checks_out_articles_from(cart).discounts
+
+
+def test_every_change_publishes_a_new_table():
+    toothbrush, rice = create_products(2)
+    index = OfferIndex(OfferHandler())
+    tables = [index.table]
+
+    index.add(Offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0))
+    tables.append(index.table)
+    index.add(Offer(SpecialOfferType.THREE_FOR_TWO, rice, 0))
+    tables.append(index.table)
+    index.remove(toothbrush)
+    tables.append(index.table)
+
+    assert [0, 1, 2, 3] == [t.version for t in tables]
+    assert [[], ["sku-0"], ["sku-0", "sku-1"], ["sku-1"]] == [list(t.plans) for t in tables]
+
+
+def test_receipts_record_the_offers_version_they_were_priced_with():
+    _, toothbrush, *_, cart, teller = setup_multiple_products_test()
+    before = teller.checks_out_articles_from(cart)
+
+    version = teller.replace_offers([Offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)])
+    after = teller.checkout_many([cart])[0]
+
+    assert 4 == before.offers_version
+    assert 5 == version == after.offers_version == teller.offers_version
+    assert 1 == len(after.discounts)
+
+
+def test_a_checkout_in_flight_keeps_its_table():
+    _, toothbrush, *_, cart, teller = setup_multiple_products_test()
+    table = teller.offer_plans.table
+
+    teller.replace_offers([])
+
+    assert 4 == len(table.matches(cart))
+    assert [] == teller.offer_plans.matches(cart)
+
+
+def test_checkouts_during_swaps_match_the_version_they_record():
+    _, toothbrush, apples, *_, cart, teller = setup_multiple_products_test()
+    three_for_two = [Offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)]
+    ten_percent = [Offer(SpecialOfferType.TEN_PERCENT_DISCOUNT, apples, 10.0)]
+    assert 5 == teller.replace_offers(three_for_two)
+    assert 6 == teller.replace_offers(ten_percent)
+    stop = threading.Event()
+
+    def publish():
+        while not stop.is_set():
+            teller.replace_offers(three_for_two)
+            teller.replace_offers(ten_percent)
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    try:
+        receipts = [teller.checks_out_articles_from(cart) for _ in range(2000)]
+    finally:
+        stop.set()
+        publisher.join()
+
+    for receipt in receipts:
+        offers = three_for_two if receipt.offers_version % 2 else ten_percent
+        assert [offers[0].product] == [d.product for d in receipt.discounts]
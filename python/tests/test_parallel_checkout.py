@@ -0,0 +1,78 @@
+import pytest
+
+from discount_memo import DiscountMemo
+from model_objects import Product, ProductUnit
+from money import MoneyOfferHandler, MoneyReceipt, MoneyTeller
+from offer_index import OfferIndex
+from parallel_checkout import ParallelCheckout
+from shopping_cart import ShoppingCart
+from teller import Teller
+from tests.fake_catalog import UnitFakeCatalog
+from workload import receipt_rows
+from .helpers import setup_multiple_products_test
+
+
+class LoudOfferHandler(MoneyOfferHandler):
+    def format_description(self, offer_type, offer_argument, offer_amount):
+        return super().format_description(offer_type, offer_argument, offer_amount).upper()
+
+
+def carts_and_teller(teller_class=Teller, offer_handler=None, **kwargs):
+    catalog, toothbrush, apples, milk, bread, soap, cart, plain = setup_multiple_products_test()
+    teller = teller_class(catalog, **kwargs)
+    if offer_handler is not None:
+        teller.offer_handler = offer_handler
+        teller.offer_plans = OfferIndex(offer_handler)
+    teller.replace_offers(plain.offers.values())
+    carts = [cart]
+    for quantity in range(1, 12):
+        extra = ShoppingCart()
+        extra.add_item_quantity(toothbrush, quantity)
+        extra.add_item_quantity(apples, quantity / 4)
+        extra.add_item_quantity(bread, quantity)
+        extra.add_item_quantity(toothbrush, 1)
+        carts.append(extra)
+    carts.append(ShoppingCart())
+    return carts, teller
+
+
+def test_parallel_checkout_matches_serial_checkout():
+    carts, teller = carts_and_teller()
+
+    receipts = ParallelCheckout(teller, max_workers=2, chunksize=3).checkout_many(carts)
+
+    serial = [teller.checks_out_articles_from(c) for c in carts]
+    assert [receipt_rows(r) for r in serial] == [receipt_rows(r) for r in receipts]
+    assert {teller.offers_version} == {r.offers_version for r in receipts}
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_workers_check_out_like_the_callers_teller(lazy):
+    carts, teller = carts_and_teller(
+        MoneyTeller, LoudOfferHandler(), discount_memo=DiscountMemo(maxsize=8))
+
+    receipts = ParallelCheckout(teller, max_workers=2, chunksize=5).checkout_many(carts, lazy)
+
+    serial = [teller.checks_out_articles_from(c) for c in carts]
+    assert all(type(r) is MoneyReceipt for r in receipts)
+    assert [receipt_rows(r) for r in serial] == [receipt_rows(r) for r in receipts]
+    assert {teller.offers_version} == {r.offers_version for r in receipts}
+    assert any(d.description.isupper() for r in receipts for d in r.discounts)
+
+
+def test_products_sharing_a_name_keep_their_own_unit_and_price():
+    catalog = UnitFakeCatalog()
+    rice_each = Product("rice", ProductUnit.EACH)
+    rice_kilo = Product("rice", ProductUnit.KILO)
+    catalog.add_product(rice_each, 1.5)
+    catalog.add_product(rice_kilo, 4.0)
+    teller = Teller(catalog)
+    cart = ShoppingCart()
+    cart.add_item_quantity(rice_each, 1)
+    cart.add_item_quantity(rice_kilo, 2)
+
+    [receipt] = ParallelCheckout(teller, max_workers=1).checkout_many([cart])
+
+    assert receipt_rows(teller.checks_out_articles_from(cart)) == receipt_rows(receipt)
+    assert [rice_each, rice_kilo] == [i.product for i in receipt.items]
+    assert 9.5 == receipt.total_price()
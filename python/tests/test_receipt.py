@@ -0,0 +1,90 @@
+import pickle
+
+import pytest
+
+from model_objects import Discount, Product, ProductUnit
+from receipt import Receipt, ReceiptItem
+
+
+def naive_total(receipt):
+    total = 0
+    for item in receipt.items:
+        total += item.total_price
+    for discount in receipt.discounts:
+        total += discount.discount_amount
+    return total
+
+
+@pytest.fixture
+def rice():
+    return Product("rice", ProductUnit.EACH)
+
+
+def test_cached_total_matches_summing_the_lines(rice):
+    receipt = Receipt()
+    for total_price in (0.1, 0.2, 0.3, 2.49):
+        receipt.add_product(rice, 1, total_price, total_price)
+    receipt.add_discount(Discount(rice, "10% off", -0.249))
+
+    assert naive_total(receipt) == receipt.total_price()
+
+
+def test_item_added_after_discount_keeps_the_summation_order(rice):
+    receipt = Receipt()
+    receipt.add_product(rice, 1, 0.1, 0.1)
+    receipt.add_discount(Discount(rice, "10% off", -0.01))
+    receipt.add_product(rice, 1, 0.2, 0.2)
+    receipt.add_product(rice, 1, 0.3, 0.3)
+
+    assert naive_total(receipt) == receipt.total_price()
+
+
+def test_views_share_storage_and_copies_do_not(rice):
+    receipt = Receipt()
+    view = receipt.item_view
+    copied = receipt.items
+
+    receipt.add_product(rice, 2, 2.49, 4.98)
+    copied.append("not a receipt item")
+
+    assert 1 == len(view)
+    assert 4.98 == view[0].total_price
+    assert 1 == len(receipt.items)
+    assert [] == list(receipt.discount_view)
+
+
+def test_views_are_read_only(rice):
+    receipt = Receipt()
+    receipt.add_product(rice, 1, 2.49, 2.49)
+
+    with pytest.raises(TypeError):
+        receipt.item_view[0] = None
+    assert not hasattr(receipt.item_view, "append")
+
+
+def test_deferred_discounts_are_added_before_any_other_discount(rice):
+    receipt = Receipt()
+    receipt.add_product(rice, 1, 2.49, 2.49)
+    receipt.defer_discounts(lambda r: r.add_discount(Discount(rice, "deferred", -0.5)))
+    receipt.add_discount(Discount(rice, "manual", -0.25))
+
+    assert ["deferred", "manual"] == [d.description for d in receipt.discount_view]
+    assert naive_total(receipt) == receipt.total_price()
+
+
+def test_pickled_receipt_comes_back_whole(rice):
+    receipt = Receipt()
+    for total_price in (0.1, 0.2, 0.3):
+        receipt.add_product(rice, 1, total_price, total_price)
+    receipt.defer_discounts(lambda r: r.add_discount(Discount(rice, "deferred", -0.05)))
+    receipt.offers_version = 7
+
+    copy = pickle.loads(pickle.dumps(receipt))
+
+    assert (receipt.total_price(), 7) == (copy.total_price(), copy.offers_version)
+    assert receipt.discounts == copy.discounts
+    assert [ReceiptItem(rice, 1, 0.1, 0.1)] == copy.items[:1]
+    assert copy.items[0].product is rice
+    copy.add_product(rice, 1, 0.4, 0.4)
+    assert 4 == len(copy.item_view)
+    assert naive_total(copy) == copy.total_price()
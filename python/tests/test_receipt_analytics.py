@@ -0,0 +1,140 @@
+import pytest
+
+import receipt_analytics
+from model_objects import Product, ProductUnit, SpecialOfferType
+from money import Money, MoneyReceipt, MoneyTeller
+from receipt_analytics import (
+    discounts_by_description, discounts_by_hour, discounts_by_offer_type,
+    discounts_by_product, offer_type_of, sales_by_product, total_histogram,
+    total_quantiles, total_summary
+)
+from receipt_archive import ReceiptArchive, ReceiptArchiveWriter
+from workload import build_workload
+
+ENGINES = [False, pytest.param(True, marks=pytest.mark.skipif(
+    not receipt_analytics.HAVE_NUMPY, reason="NumPy is not installed"))]
+START = 1_700_000_000.0
+
+
+def group_sum(pairs):
+    sums = {}
+    for key, value in pairs:
+        sums[key] = sums.get(key, 0) + value
+    return sums
+
+
+@pytest.fixture(scope="module")
+def day():
+    workload = build_workload(baskets=300, lines=6)
+    receipts = workload.teller.checkout_many(workload.carts)
+    # Every eleventh receipt has no timestamp.
+    timestamps = [None if n % 11 == 0 else START + 60 * n for n in range(len(receipts))]
+    return receipts, timestamps
+
+
+@pytest.fixture
+def archive(day, tmp_path):
+    path = tmp_path / "day.receipts"
+    with ReceiptArchiveWriter(path, chunk_size=64) as writer:
+        for receipt, timestamp in zip(*day):
+            writer.write(receipt, timestamp)
+    with ReceiptArchive(path) as archive:
+        yield archive
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+def test_sums_by_product_and_description(day, archive, use_numpy):
+    receipts, _ = day
+    items = [i for r in receipts for i in r.item_view]
+    discounts = [d for r in receipts for d in r.discount_view]
+
+    assert pytest.approx(group_sum((i.product, i.total_price) for i in items)) == \
+        sales_by_product(archive, use_numpy)
+    assert pytest.approx(group_sum((d.product, d.discount_amount) for d in discounts)) == \
+        discounts_by_product(archive, use_numpy)
+    assert pytest.approx(group_sum((d.description, d.discount_amount) for d in discounts)) == \
+        discounts_by_description(archive, use_numpy)
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+def test_discounts_by_hour(day, archive, use_numpy):
+    rows = [
+        (int(t // 3600) * 3600, d)
+        for r, t in zip(*day) if t is not None for d in r.discount_view
+    ]
+
+    assert pytest.approx(group_sum((h, d.discount_amount) for h, d in rows)) == \
+        discounts_by_hour(archive, use_numpy=use_numpy)
+    assert pytest.approx(group_sum(((h, d.product), d.discount_amount) for h, d in rows)) == \
+        discounts_by_hour(archive, by_product=True, use_numpy=use_numpy)
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+def test_total_distribution(day, archive, use_numpy):
+    totals = sorted(r.total_price() for r in day[0])
+    edges = [0, 20, 40, 80, 1000]
+
+    summary = total_summary(archive)
+    assert (len(totals), totals[0], totals[-1]) == (summary.count, summary.minimum, summary.maximum)
+    assert sum(total_histogram(archive, edges, use_numpy)) == \
+        sum(1 for t in totals if 0 <= t <= 1000)
+    assert pytest.approx([totals[0], totals[-1]]) == \
+        total_quantiles(archive, [0, 1], use_numpy)
+
+
+@pytest.mark.skipif(not receipt_analytics.HAVE_NUMPY, reason="NumPy is not installed")
+def test_numpy_and_python_sums_are_identical(archive):
+    for query in (sales_by_product, discounts_by_product, discounts_by_description):
+        assert query(archive, use_numpy=False) == query(archive, use_numpy=True)
+    assert discounts_by_hour(archive, True, use_numpy=False) == \
+        discounts_by_hour(archive, True, use_numpy=True)
+
+
+def test_offer_types_come_from_the_description_templates():
+    assert SpecialOfferType.THREE_FOR_TWO == offer_type_of("3 for 2")
+    assert SpecialOfferType.TWO_FOR_AMOUNT == offer_type_of("2 for 0.99")
+    assert SpecialOfferType.FIVE_FOR_AMOUNT == offer_type_of("5 for 7.49")
+    assert SpecialOfferType.TEN_PERCENT_DISCOUNT == offer_type_of("12.5% off")
+    assert offer_type_of("staff discount") is None
+
+
+def test_money_archives_give_exact_money_sums(day, tmp_path):
+    workload = build_workload(baskets=200, lines=6)
+    teller = MoneyTeller(workload.catalog)
+    teller.replace_offers(workload.teller.offers.values())
+    receipts = teller.checkout_many(workload.carts)
+    path = tmp_path / "money.receipts"
+    with ReceiptArchiveWriter(path, chunk_size=50) as writer:
+        for receipt in receipts:
+            writer.write(receipt)
+
+    expected = group_sum(
+        (d.description, d.discount_amount) for r in receipts for d in r.discount_view)
+    with ReceiptArchive(path) as archive:
+        by_type = discounts_by_offer_type(archive)
+        assert expected == discounts_by_description(archive)
+        assert sum(expected.values()) == sum(by_type.values())
+        assert all(isinstance(amount, Money) for amount in by_type.values())
+        assert Money(sum(r.total_price() for r in receipts)) == total_summary(archive).sum
+
+
+@pytest.mark.parametrize("use_numpy", ENGINES)
+def test_money_archive_totals_are_money_in_major_units(tmp_path, use_numpy):
+    rice = Product("rice", ProductUnit.EACH)
+    path = tmp_path / "money.receipts"
+    with ReceiptArchiveWriter(path) as writer:
+        for cents in (1260, 500, 2000, 995):
+            receipt = MoneyReceipt()
+            receipt.add_product(rice, 1, Money(cents), Money(cents))
+            writer.write(receipt)
+
+    with ReceiptArchive(path) as archive:
+        summary = total_summary(archive)
+        quantiles = total_quantiles(archive, [0, 0.5, 1], use_numpy)
+        histogram = total_histogram(archive, [0, 10, 12.6, 20], use_numpy)
+
+    assert (4, Money(4755), Money(1189)) == (summary.count, summary.sum, summary.mean)
+    assert "11.89" == str(summary.mean)
+    assert [Money(500), Money(1128), Money(2000)] == quantiles
+    assert all(type(q) is Money for q in quantiles)
+    assert [2, 0, 2] == histogram
@@ -0,0 +1,152 @@
+import io
+
+import pytest
+
+from model_objects import Product, ProductUnit
+from money import Money, MoneyTeller
+from receipt import Receipt
+from receipt_archive import ReceiptArchive, ReceiptArchiveWriter
+from receipt_printer import ReceiptPrinter
+from workload import receipt_rows
+from .helpers import setup_multiple_products_test
+
+
+def checked_out_receipts():
+    _, toothbrush, *_, cart, teller = setup_multiple_products_test()
+    receipts = [teller.checks_out_articles_from(cart)]
+    for quantity in range(1, 8):
+        receipt = Receipt()
+        receipt.add_product(toothbrush, quantity, 0.99, quantity * 0.99)
+        receipt.add_product(toothbrush, 2.0, 0.99, 2.0 * 0.99)
+        receipts.append(receipt)
+    receipts.append(Receipt())
+    return receipts
+
+
+def test_receipts_round_trip_across_chunks(tmp_path):
+    path = tmp_path / "day.receipts"
+    receipts = checked_out_receipts()
+
+    with ReceiptArchiveWriter(path, chunk_size=3) as writer:
+        for n, receipt in enumerate(receipts):
+            writer.write(receipt, timestamp=1_700_000_000.0 + n if n % 2 else None)
+
+    with ReceiptArchive(path) as archive:
+        records = list(archive.records())
+        totals = archive.scan_totals()
+
+    assert len(receipts) == len(records)
+    assert [receipt_rows(r) for r in receipts] == [receipt_rows(r) for _, r in records]
+    assert [r.offers_version for r in receipts] == [r.offers_version for _, r in records]
+    assert [None, 1_700_000_001.0] == [t for t, _ in records[:2]]
+    assert [r.total_price() for r in receipts] == list(totals)
+
+
+def test_round_trip_prints_byte_identical_receipts(tmp_path):
+    path = tmp_path / "day.receipts"
+    receipts = checked_out_receipts()
+    with ReceiptArchiveWriter(path) as writer:
+        for receipt in receipts:
+            writer.write(receipt)
+
+    printer = ReceiptPrinter()
+    with ReceiptArchive(path) as archive:
+        assert [printer.print_receipt(r) for r in receipts] == \
+            [printer.print_receipt(r) for r in archive]
+
+
+def test_money_receipts_keep_exact_cents(tmp_path):
+    catalog, *_, cart, float_teller = setup_multiple_products_test()
+    teller = MoneyTeller(catalog)
+    teller.replace_offers(float_teller.offers.values())
+    receipt = teller.checks_out_articles_from(cart)
+    path = tmp_path / "money.receipts"
+
+    with ReceiptArchiveWriter(path) as writer:
+        writer.write(receipt)
+
+    with ReceiptArchive(path) as archive:
+        restored, = archive
+        assert archive.money
+        assert Money(1260) == archive.scan_totals()[0]
+    assert receipt_rows(receipt) == receipt_rows(restored)
+    assert receipt.offers_version == restored.offers_version
+    assert isinstance(restored.total_price(), Money)
+    assert isinstance(restored.items[0].price, Money)
+
+
+def test_products_and_descriptions_are_stored_once(tmp_path):
+    apples = Product("apples", ProductUnit.KILO)
+    stream = io.BytesIO()
+    writer = ReceiptArchiveWriter(stream)
+    for _ in range(100):
+        receipt = Receipt()
+        receipt.add_product(apples, 1.5, 2.0, 3.0)
+        writer.write(receipt)
+    writer.close()
+    path = tmp_path / "apples.receipts"
+    path.write_bytes(stream.getvalue())
+
+    with ReceiptArchive(path) as archive:
+        assert [apples] == archive.products
+        assert 1 == stream.getvalue().count(b"apples")
+        assert 100 == len(archive)
+
+
+def test_rejects_files_that_are_not_archives(tmp_path):
+    path = tmp_path / "not.receipts"
+    path.write_bytes(b"hello world, this is not an archive")
+
+    with pytest.raises(ValueError):
+        ReceiptArchive(path)
+
+
+def test_rejects_an_archive_without_its_footer(tmp_path):
+    path = tmp_path / "partial.receipts"
+    stream = io.BytesIO()
+    writer = ReceiptArchiveWriter(stream)
+    writer.write(checked_out_receipts()[0])
+    writer.close()
+    path.write_bytes(stream.getvalue()[:-4])
+
+    with pytest.raises(ValueError):
+        ReceiptArchive(path)
+
+
+@pytest.mark.parametrize("money", [None, True, False])
+def test_receipts_of_the_other_kind_are_rejected_untouched(tmp_path, money):
+    catalog, *_, cart, float_teller = setup_multiple_products_test()
+    money_teller = MoneyTeller(catalog)
+    money_teller.replace_offers(float_teller.offers.values())
+    first, other = float_teller, money_teller
+    if money:
+        first, other = other, first
+    path = tmp_path / "mixed.receipts"
+
+    with ReceiptArchiveWriter(path, money=money) as writer:
+        writer.write(first.checks_out_articles_from(cart))
+        with pytest.raises(ValueError):
+            writer.write(other.checks_out_articles_from(cart))
+        writer.write(first.checks_out_articles_from(cart))
+
+    with ReceiptArchive(path) as archive:
+        assert bool(money) == archive.money
+        assert 2 == len(archive)
+        expected = receipt_rows(first.checks_out_articles_from(cart))
+        assert [expected, expected] == [receipt_rows(r) for r in archive]
+
+
+def test_a_failed_write_leaves_the_columns_even(tmp_path):
+    apples = Product("apples", ProductUnit.KILO)
+    bad = Receipt()
+    bad.add_product(apples, 1.5, "2.00", 3.0)
+    good = checked_out_receipts()[1]
+    path = tmp_path / "day.receipts"
+
+    with ReceiptArchiveWriter(path) as writer:
+        with pytest.raises(TypeError):
+            writer.write(bad)
+        writer.write(good)
+
+    with ReceiptArchive(path) as archive:
+        assert [receipt_rows(good)] == [receipt_rows(r) for r in archive]
@@ -0,0 +1,89 @@
+import io
+
+from model_objects import Discount, Product, ProductUnit
+from money import Money
+from receipt import Receipt
+from receipt_printer import ReceiptPrinter
+from .helpers import setup_multiple_products_test
+
+EXPECTED_RECEIPT = (
+    "toothbrush                          3.00\n"
+    "  1.00 * 3\n"
+    "apples                              4.00\n"
+    "  2.00 * 2.000\n"
+    "milk                                3.00\n"
+    "  1.50 * 2\n"
+    "bread                               5.00\n"
+    "  1.00 * 5\n"
+    "soap                                0.50\n"
+    "3 for 2 (toothbrush)               -1.00\n"
+    "10.0% off (apples)                 -0.40\n"
+    "2 for 2.5 (milk)                   -0.50\n"
+    "5 for 4.0 (bread)                  -1.00\n"
+    "\n"
+    "Total:                             12.60\n"
+)
+
+
+def checked_out_receipt():
+    *_, cart, teller = setup_multiple_products_test()
+    return teller.checks_out_articles_from(cart)
+
+
+def test_print_receipt():
+    assert EXPECTED_RECEIPT == ReceiptPrinter().print_receipt(checked_out_receipt())
+
+
+def test_write_receipt_streams_the_same_text():
+    stream = io.StringIO()
+
+    ReceiptPrinter().write_receipt(checked_out_receipt(), stream)
+
+    assert EXPECTED_RECEIPT == stream.getvalue()
+
+
+def test_iter_receipt_lines_yields_one_line_at_a_time():
+    lines = list(ReceiptPrinter().iter_receipt_lines(checked_out_receipt()))
+
+    assert "soap                                0.50\n" in lines
+    assert EXPECTED_RECEIPT == "".join(lines)
+
+
+def test_cached_lines_are_reused_across_receipts():
+    printer = ReceiptPrinter()
+    receipt = checked_out_receipt()
+
+    printer.print_receipt(receipt)
+    assert EXPECTED_RECEIPT == printer.print_receipt(checked_out_receipt())
+
+    assert 9 == len(printer.line_cache)
+    assert 9 == printer.line_cache.hits
+
+
+def test_line_cache_tells_equal_values_of_different_types_apart():
+    apples = Product("apples", ProductUnit.EACH)
+    receipt = Receipt()
+    receipt.add_product(apples, 2, 1, 2)
+    receipt.add_product(apples, 2.0, 1.0, 2.0)
+    receipt.add_product(apples, 2, Money(100), Money(200))
+    receipt.add_product(apples, 1, -0.0, -0.0)
+    receipt.add_product(apples, 1, 0.0, 0.0)
+    receipt.add_discount(Discount(apples, "free", -0.0))
+    receipt.add_discount(Discount(apples, "free", 0.0))
+    uncached = ReceiptPrinter(line_cache_size=0)
+    printer = ReceiptPrinter()
+
+    printer.print_receipt(receipt)
+
+    assert uncached.print_receipt(receipt) == printer.print_receipt(receipt)
+
+
+def test_line_cache_follows_the_column_width():
+    receipt = checked_out_receipt()
+    printer = ReceiptPrinter()
+    printer.print_receipt(receipt)
+
+    for columns in (12, 60):
+        printer.columns = columns
+        assert ReceiptPrinter(columns, line_cache_size=0).print_receipt(receipt) == \
+            printer.print_receipt(receipt)
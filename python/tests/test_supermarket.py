@@ -4,6 +4,7 @@ from model_objects import Product, SpecialOfferType, ProductUnit
 from shopping_cart import ShoppingCart
 from teller import Teller
 from tests.fake_catalog import FakeCatalog
+from workload import receipt_rows
 from .helpers import (
     setup_five_for_amount_test,
     setup_three_for_two_test,
@@ -155,3 +156,142 @@ def test_multiple_products_different_offers():
     # Total: 2 + 3.60 + 2.50 + 4 = 12.10
     expected_total = 2 + 3.60 + 2.50 + 4 + 0.50
     assert expected_total == receipt.total_price()
+
+
+class CountingCatalog(FakeCatalog):
+    def __init__(self):
+        super().__init__()
+        self.bulk_calls = 0
+
+    def unit_prices(self, products):
+        self.bulk_calls += 1
+        return super().unit_prices(products)
+
+    def unit_price(self, product):
+        if self.bulk_calls == 0:
+            raise AssertionError("prices must be fetched in bulk")
+        return super().unit_price(product)
+
+
+def test_checkout_fetches_prices_in_one_call():
+    catalog = CountingCatalog()
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    catalog.add_product(toothbrush, 1)
+    apples = Product("apples", ProductUnit.KILO)
+    catalog.add_product(apples, 2)
+
+    teller = Teller(catalog)
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+
+    cart = ShoppingCart()
+    cart.add_item_quantity(toothbrush, 2)
+    cart.add_item_quantity(apples, 1.5)
+    cart.add_item_quantity(toothbrush, 1)
+
+    receipt = teller.checks_out_articles_from(cart)
+
+    assert 1 == catalog.bulk_calls
+    assert 3 == len(receipt.items)
+    assert 2 + 3 == receipt.total_price()
+
+
+class UnitPriceOnlyCatalog:
+    """A catalog from before unit_prices: it can only price one product."""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    def unit_price(self, product):
+        return self.prices[product]
+
+
+def test_checkout_accepts_a_catalog_without_unit_prices():
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    apples = Product("apples", ProductUnit.KILO)
+    teller = Teller(UnitPriceOnlyCatalog({toothbrush: 1, apples: 2}))
+    teller.add_special_offer(SpecialOfferType.THREE_FOR_TWO, toothbrush, 0)
+    cart = ShoppingCart()
+    cart.add_item_quantity(toothbrush, 3)
+    cart.add_item_quantity(apples, 1.5)
+
+    receipt = teller.checks_out_articles_from(cart)
+
+    assert 2 + 3 == receipt.total_price()
+    assert [receipt.total_price()] == [r.total_price() for r in teller.checkout_many([cart])]
+
+
+def test_checkout_many_matches_single_checkouts():
+    catalog, toothbrush, apples, milk, bread, soap, cart, teller = setup_multiple_products_test()
+    small_cart = ShoppingCart()
+    small_cart.add_item_quantity(milk, 3)
+    small_cart.add_item_quantity(apples, 0.5)
+    empty_cart = ShoppingCart()
+    carts = [cart, small_cart, empty_cart, cart]
+
+    receipts = teller.checkout_many(carts)
+
+    expected = [teller.checks_out_articles_from(c) for c in carts]
+    assert [receipt_rows(r) for r in expected] == [receipt_rows(r) for r in receipts]
+
+
+def test_checkout_many_fetches_prices_once_per_batch():
+    catalog = CountingCatalog()
+    toothbrush = Product("toothbrush", ProductUnit.EACH)
+    catalog.add_product(toothbrush, 1)
+    teller = Teller(catalog)
+    carts = []
+    for quantity in range(1, 5):
+        cart = ShoppingCart()
+        cart.add_item_quantity(toothbrush, quantity)
+        carts.append(cart)
+
+    teller.checkout_many(carts)
+
+    assert 1 == catalog.bulk_calls
+
+
+def test_lazy_checkout_matches_eager_checkout():
+    catalog, toothbrush, apples, milk, bread, soap, cart, teller = setup_multiple_products_test()
+    small_cart = ShoppingCart()
+    small_cart.add_item_quantity(milk, 3)
+    carts = [cart, small_cart, ShoppingCart()]
+
+    eager = [receipt_rows(teller.checks_out_articles_from(c)) for c in carts]
+
+    assert eager == [receipt_rows(teller.checks_out_articles_from(c, lazy=True)) for c in carts]
+    assert eager == [receipt_rows(r) for r in teller.checkout_many(carts, lazy=True)]
+
+
+def test_lazy_checkout_runs_the_offer_pass_once_on_first_read():
+    catalog, toothbrush, apples, milk, bread, soap, cart, teller = setup_multiple_products_test()
+    calls = []
+    apply_offer_index = teller.offer_handler.apply_offer_index
+
+    def counting_apply(*args, **kwargs):
+        calls.append(args)
+        return apply_offer_index(*args, **kwargs)
+    teller.offer_handler.apply_offer_index = counting_apply
+
+    receipt = teller.checks_out_articles_from(cart, lazy=True)
+    assert len(cart.items) == len(receipt.item_view)
+    assert [] == calls
+
+    total = receipt.total_price()
+    discounts = receipt.discounts
+    assert 1 == len(calls)
+    assert discounts
+    assert total == receipt.total_price()
+    assert 1 == len(calls)
+
+
+def test_lazy_receipt_ignores_changes_made_after_checkout():
+    catalog, toothbrush, apples, milk, bread, soap, cart, teller = setup_multiple_products_test()
+    expected = receipt_rows(teller.checks_out_articles_from(cart))
+    version = teller.offers_version
+
+    receipt = teller.checks_out_articles_from(cart, lazy=True)
+    cart.add_item_quantity(toothbrush, 10)
+    teller.replace_offers([])
+
+    assert expected == receipt_rows(receipt)
+    assert version == receipt.offers_version
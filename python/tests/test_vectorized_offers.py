@@ -0,0 +1,50 @@
+import pytest
+
+from model_objects import SpecialOfferType
+from offer_handler import OfferHandler
+from vectorized_offers import compute_discounts
+
+ROWS = [
+    # quantity, unit price, offer type, argument
+    (3, 0.99, SpecialOfferType.THREE_FOR_TWO, 0),
+    (2, 0.99, SpecialOfferType.THREE_FOR_TWO, 0),
+    (7.5, 1.25, SpecialOfferType.THREE_FOR_TWO, 0),
+    (1, 0.69, SpecialOfferType.TWO_FOR_AMOUNT, 0.99),
+    (3, 0.69, SpecialOfferType.TWO_FOR_AMOUNT, 0.99),
+    (2.9, 0.69, SpecialOfferType.TWO_FOR_AMOUNT, 0.99),
+    (4, 1.79, SpecialOfferType.FIVE_FOR_AMOUNT, 7.49),
+    (11, 1.79, SpecialOfferType.FIVE_FOR_AMOUNT, 7.49),
+    (2.5, 1.99, SpecialOfferType.TEN_PERCENT_DISCOUNT, 20.0),
+    (0, 2.49, SpecialOfferType.TEN_PERCENT_DISCOUNT, 10.0),
+]
+
+
+def expected_discounts():
+    handler = OfferHandler()
+    expected = []
+    for quantity, unit_price, offer_type, argument in ROWS:
+        config = handler.get_offer_config(offer_type)
+        expected.append(config['calculation_handler'](
+            quantity, unit_price, argument, config['quantity']))
+    return expected
+
+
+def columns():
+    return [list(column) for column in zip(*ROWS)]
+
+
+def test_python_fallback_matches_offer_handler():
+    assert expected_discounts() == compute_discounts(*columns(), use_numpy=False)
+
+
+def test_numpy_engine_matches_offer_handler_exactly():
+    pytest.importorskip("numpy")
+
+    assert expected_discounts() == compute_discounts(*columns(), use_numpy=True)
+
+
+def test_columns_must_have_the_same_length():
+    quantities, unit_prices, offer_types, arguments = columns()
+
+    with pytest.raises(ValueError):
+        compute_discounts(quantities[:-1], unit_prices, offer_types, arguments)
@@ -0,0 +1,134 @@
+"""Columnar discount calculation for batch repricing.
+
+compute_discounts takes parallel sequences of quantities, unit prices,
+offer types and offer arguments, and returns the discount each row would
+get from OfferHandler. Rows below an offer's threshold give None. When
+NumPy is installed, each offer type is evaluated with a handful of array
+operations. Otherwise every row goes through the OfferHandler handlers.
+discount_columns is the NumPy-only form that keeps results as arrays.
+"""
+from typing import Any, Optional, Sequence, Union
+
+from model_objects import SpecialOfferType
+from offer_handler import OfferHandler
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None
+
+HAVE_NUMPY = np is not None
+
+Number = Union[int, float]
+
+
+def compute_discounts(
+    quantities: Sequence[Number],
+    unit_prices: Sequence[Number],
+    offer_types: Sequence[SpecialOfferType],
+    arguments: Sequence[Number],
+    use_numpy: Optional[bool] = None,
+    offer_handler: Optional[OfferHandler] = None
+) -> list[Optional[float]]:
+    if not len(quantities) == len(unit_prices) == len(offer_types) == len(arguments):
+        raise ValueError("all columns must have the same length")
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY
+    elif use_numpy and not HAVE_NUMPY:
+        raise ImportError("NumPy is required for use_numpy=True")
+    offer_handler = offer_handler or OfferHandler()
+    if use_numpy:
+        return _compute_with_numpy(
+            quantities, unit_prices, offer_types, arguments, offer_handler)
+    return _compute_in_python(
+        quantities, unit_prices, offer_types, arguments, offer_handler)
+
+
+def _compute_in_python(
+    quantities: Sequence[Number],
+    unit_prices: Sequence[Number],
+    offer_types: Sequence[SpecialOfferType],
+    arguments: Sequence[Number],
+    offer_handler: OfferHandler
+) -> list[Optional[float]]:
+    discounts: list[Optional[float]] = []
+    for quantity, unit_price, offer_type, argument in zip(
+            quantities, unit_prices, offer_types, arguments):
+        offer_config = offer_handler.get_offer_config(offer_type)
+        discount = offer_config['calculation_handler'](
+            quantity, unit_price, argument, offer_config['quantity'])
+        discounts.append(None if discount is None else float(discount))
+    return discounts
+
+
+def _compute_with_numpy(
+    quantities: Sequence[Number],
+    unit_prices: Sequence[Number],
+    offer_types: Sequence[SpecialOfferType],
+    arguments: Sequence[Number],
+    offer_handler: OfferHandler
+) -> list[Optional[float]]:
+    discount, applies = discount_columns(
+        quantities, unit_prices, offer_types, arguments, offer_handler)
+    return [
+        value if ok else None
+        for value, ok in zip(discount.tolist(), applies.tolist())
+    ]
+
+
+def discount_columns(
+    quantities: Any,
+    unit_prices: Any,
+    offer_types: Any,
+    arguments: Any,
+    offer_handler: Optional[OfferHandler] = None
+) -> tuple[Any, Any]:
+    """Array-in, array-out form of compute_discounts; requires NumPy.
+
+    offer_types may hold SpecialOfferType members or their integer values.
+    Returns the discount amounts and a boolean mask of the rows the offer
+    applies to; amounts outside the mask are meaningless.
+    """
+    if not HAVE_NUMPY:
+        raise ImportError("NumPy is required for discount_columns")
+    offer_handler = offer_handler or OfferHandler()
+    quantity = np.asarray(quantities, dtype=np.float64)
+    unit_price = np.asarray(unit_prices, dtype=np.float64)
+    argument = np.asarray(arguments, dtype=np.float64)
+    if isinstance(offer_types, np.ndarray):
+        type_codes = offer_types.astype(np.int64, copy=False)
+    else:
+        type_codes = np.fromiter(
+            (getattr(t, 'value', t) for t in offer_types),
+            dtype=np.int64, count=len(offer_types))
+    # int(quantity) truncates toward zero.
+    quantity_as_int = np.trunc(quantity)
+
+    discount = np.zeros_like(quantity)
+    applies = np.zeros(quantity.shape, dtype=bool)
+    for offer_type in SpecialOfferType:
+        rows = type_codes == offer_type.value
+        if not rows.any():
+            continue
+        offer_amount = offer_handler.get_offer_config(offer_type)['quantity']
+        q, u, a, qi = quantity[rows], unit_price[rows], argument[rows], quantity_as_int[rows]
+        # Each formula mirrors the matching OfferHandler._handle_* method
+        # operation for operation, so results are bit-identical.
+        if offer_type == SpecialOfferType.THREE_FOR_TWO:
+            qualified = np.floor(qi / offer_amount)
+            amount = -(q * u - ((qualified * 2 * u) + np.mod(qi, 3) * u))
+            ok = qi > 2
+        elif offer_type == SpecialOfferType.TWO_FOR_AMOUNT:
+            total = a * (qi / offer_amount) + np.mod(qi, 2) * u
+            amount = -(u * q - total)
+            ok = qi >= offer_amount
+        elif offer_type == SpecialOfferType.FIVE_FOR_AMOUNT:
+            qualified = np.floor(qi / offer_amount)
+            amount = -(u * q - (a * qualified + np.mod(qi, 5) * u))
+            ok = qi >= 5
+        else:
+            amount = -q * u * a / 100.0
+            ok = np.ones(q.shape, dtype=bool)
+        discount[rows] = amount
+        applies[rows] = ok
+    return discount, applies
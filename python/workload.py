@@ -0,0 +1,107 @@
+"""Seeded synthetic catalogs, offers and baskets.
+
+Shared by the benchmark suite and the tests, together with receipt_rows
+for comparing the receipts they produce.
+"""
+import random
+from typing import NamedTuple, Optional, Union
+
+from catalog import SupermarketCatalog
+from model_objects import Offer, Product, ProductUnit, SpecialOfferType
+from shopping_cart import ShoppingCart
+from teller import Teller
+
+OFFER_ARGUMENTS = {
+    SpecialOfferType.THREE_FOR_TWO: [0],
+    SpecialOfferType.TEN_PERCENT_DISCOUNT: [10.0, 20.0, 12.5],
+    SpecialOfferType.TWO_FOR_AMOUNT: [0.99, 2.5, 4.0],
+    SpecialOfferType.FIVE_FOR_AMOUNT: [4.0, 7.49],
+}
+
+
+class SyntheticCatalog(SupermarketCatalog):
+    """A catalog of `skus` products whose prices are derived from the seed.
+
+    Nothing is stored per SKU, so catalogs of millions of products cost no
+    memory until a basket mentions a product.
+    """
+
+    def __init__(self, skus: int, seed: int = 1) -> None:
+        self.skus = skus
+        self.seed = seed
+        self._overrides: dict[str, Union[int, float]] = {}
+
+    def product(self, index: int) -> Product:
+        unit = ProductUnit.KILO if index % 5 == 0 else ProductUnit.EACH
+        return Product(f"sku-{index:08d}", unit)
+
+    def add_product(self, product: Product, price: Union[int, float]) -> None:
+        self._overrides[product.name] = price
+
+    def unit_price(self, product: Product) -> Union[int, float]:
+        price = self._overrides.get(product.name)
+        if price is not None:
+            return price
+        index = int(product.name[4:])
+        if not 0 <= index < self.skus:
+            raise KeyError(product.name)
+        # A cheap multiplicative hash spreads prices over 0.20 .. 20.19.
+        cents = 20 + (index * 2654435761 + self.seed * 40503) % 2000
+        return cents / 100
+
+
+class Workload(NamedTuple):
+    catalog: SyntheticCatalog
+    teller: Teller
+    carts: list[ShoppingCart]
+
+
+def build_workload(
+    seed: int = 1,
+    skus: int = 1_000,
+    baskets: int = 1_000,
+    lines: int = 10,
+    offers: Optional[int] = None,
+    hot_share: float = 0.8
+) -> Workload:
+    """Build a teller with offers and a list of carts.
+
+    `offers` defaults to one SKU in ten, capped at 100k. A `hot_share` of
+    basket lines comes from the most popular 1% of SKUs, the rest is
+    spread over the whole catalog.
+    """
+    rng = random.Random(seed)
+    catalog = SyntheticCatalog(skus, seed)
+    teller = Teller(catalog)
+
+    if offers is None:
+        offers = min(max(1, skus // 10), 100_000)
+    offer_types = list(OFFER_ARGUMENTS)
+    table = []
+    for index in rng.sample(range(skus), min(offers, skus)):
+        offer_type = rng.choice(offer_types)
+        table.append(Offer(
+            offer_type, catalog.product(index), rng.choice(OFFER_ARGUMENTS[offer_type])))
+    teller.replace_offers(table)
+
+    hot_skus = max(1, skus // 100)
+    carts = []
+    for _ in range(baskets):
+        cart = ShoppingCart()
+        for _ in range(lines):
+            if rng.random() < hot_share:
+                product = catalog.product(rng.randrange(hot_skus))
+            else:
+                product = catalog.product(rng.randrange(skus))
+            if product.unit == ProductUnit.KILO:
+                quantity = round(rng.uniform(0.1, 3.0), 3)
+            else:
+                quantity = rng.randint(1, 6)
+            cart.add_item_quantity(product, quantity)
+        carts.append(cart)
+    return Workload(catalog, teller, carts)
+
+
+def receipt_rows(receipt):
+    """A receipt's lines and total, for comparing two receipts."""
+    return receipt.items, receipt.discounts, receipt.total_price()
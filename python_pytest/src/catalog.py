@@ -7,3 +7,6 @@ class SupermarketCatalog:
     def unit_price(self, product):
         raise Exception("cannot be called from a unit test - it accesses the database")
 
+    def add_products(self, products_and_prices):
+        for product, price in products_and_prices:
+            self.add_product(product, price)
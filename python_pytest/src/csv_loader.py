@@ -0,0 +1,142 @@
+"""
+Streaming loaders for the catalog, offers and basket CSV files.
+
+Rows are read as tuples with the column positions resolved once from the
+header, and catalog rows are inserted in batches. Each loader returns a
+LoadStats with the row count and throughput. Results are the same as
+reading the files with csv.DictReader, including missing files, which
+load nothing.
+
+    python csv_loader.py catalog.csv
+"""
+
+import csv
+import json
+import sys
+import time
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from model_objects import Product, SpecialOfferType, ProductUnit
+
+
+class LoadStats:
+    def __init__(self, rows=0, seconds=0.0):
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return f"LoadStats(rows={self.rows}, seconds={self.seconds:.3f}, rows_per_second={self.rows_per_second:.0f})"
+
+
+def _column_reader(csv_file, *columns):
+    """Yield a tuple of the requested columns for each non-blank row."""
+    with open(csv_file, "r") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        indexes = None
+        for row in reader:
+            if not row:
+                continue
+            if indexes is None:
+                # Resolved on the first row, which is when DictReader would
+                # fail on a missing column. The last column with a given
+                # name wins, as it does in DictReader.
+                positions = {name: i for i, name in enumerate(header)}
+                indexes = [positions[column] for column in columns]
+                get = itemgetter(*indexes)
+            try:
+                yield get(row)
+            except IndexError:
+                # DictReader fills the columns a short row lacks with None.
+                yield tuple(row[i] if i < len(row) else None for i in indexes)
+
+
+def load_catalog(catalog_file, catalog, batch_size=10000):
+    start = time.perf_counter()
+    rows = 0
+    if catalog_file.exists():
+        units = ProductUnit.__members__
+        batch = []
+        for name, unit, price in _column_reader(catalog_file, 'name', 'unit', 'price'):
+            batch.append((Product(name, units[unit]), float(price)))
+            if len(batch) == batch_size:
+                catalog.add_products(batch)
+                rows += len(batch)
+                batch = []
+        if batch:
+            catalog.add_products(batch)
+            rows += len(batch)
+    return LoadStats(rows, time.perf_counter() - start)
+
+
+def load_offers(offers_file, teller):
+    start = time.perf_counter()
+    rows = 0
+    if offers_file.exists():
+        offer_types = SpecialOfferType.__members__
+        for name, offer, argument in _column_reader(offers_file, 'name', 'offer', 'argument'):
+            offer_type = offer_types[offer]
+            teller.add_special_offer(offer_type, teller.product_with_name(name), float(argument))
+            rows += 1
+    return LoadStats(rows, time.perf_counter() - start)
+
+
+def load_basket(cart_file, catalog, cart):
+    start = time.perf_counter()
+    rows = 0
+    if cart_file.exists():
+        products = catalog.products
+        for name, quantity in _column_reader(cart_file, 'name', 'quantity'):
+            quantity = float(quantity)
+            cart.add_item_quantity(products[name], quantity)
+            rows += 1
+    return LoadStats(rows, time.perf_counter() - start)
+
+
+def iter_basket_rows(baskets_file):
+    """Yield (basket_id, [(name, quantity), ...]) for each basket in a file.
+
+    A .jsonl file holds one basket per line, as
+    {"basket_id": ..., "items": [{"name": ..., "quantity": ...}, ...]}.
+    Any other file is read as CSV with basket_id, name and quantity
+    columns, where consecutive rows with the same basket_id form a basket.
+    """
+    if not baskets_file.exists():
+        return
+    if baskets_file.suffix == ".jsonl":
+        with open(baskets_file, "r") as f:
+            for line in f:
+                if line.strip():
+                    basket = json.loads(line)
+                    rows = [(item['name'], float(item['quantity'])) for item in basket['items']]
+                    yield basket['basket_id'], rows
+        return
+    rows = _column_reader(baskets_file, 'basket_id', 'name', 'quantity')
+    for basket_id, basket_rows in groupby(rows, key=itemgetter(0)):
+        yield basket_id, [(name, float(quantity)) for _, name, quantity in basket_rows]
+
+
+def fill_basket(rows, catalog, cart):
+    products = catalog.products
+    for name, quantity in rows:
+        cart.add_item_quantity(products[name], quantity)
+    return cart
+
+
+def main(args):
+    from tests.fake_catalog import FakeCatalog
+    for catalog_file in args:
+        stats = load_catalog(Path(catalog_file), FakeCatalog())
+        print(f"{catalog_file}: {stats.rows} rows in {stats.seconds:.3f}s ({stats.rows_per_second:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
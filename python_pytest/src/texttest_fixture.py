@@ -2,12 +2,22 @@
 Start texttest from a command prompt in the same folder as this file with this command:
 
 texttest -a sr -d .
+
+To price many baskets in one run, pass a multi-basket file (CSV with a
+basket_id column, or JSONL); the catalog and offers are loaded once and
+every receipt is written to one output stream:
+
+python texttest_fixture.py --baskets baskets.csv [--output receipts.txt] [--workers 4]
 """
 
-import sys,csv
+import argparse
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
-from model_objects import Product, SpecialOfferType, ProductUnit
+from csv_loader import fill_basket, iter_basket_rows, load_basket, load_catalog, load_offers
 from receipt_printer import ReceiptPrinter
 from shopping_cart import ShoppingCart
 from teller import Teller
@@ -16,53 +26,91 @@ from tests.fake_catalog import FakeCatalog
 
 def read_catalog(catalog_file):
     catalog = FakeCatalog()
-    if not catalog_file.exists():
-        return catalog
-    with open(catalog_file, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row['name']
-            unit = ProductUnit[row['unit']]
-            price = float(row['price'])
-            product = Product(name, unit)
-            catalog.add_product(product, price)
+    load_catalog(catalog_file, catalog)
     return catalog
 
 
 def read_offers(offers_file, teller):
-    if not offers_file.exists():
-        return
-    with open(offers_file, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row['name']
-            offerType = SpecialOfferType[row['offer']]
-            argument = float(row['argument'])
-            product = teller.product_with_name(name)
-            teller.add_special_offer(offerType, product, argument)
+    load_offers(offers_file, teller)
 
 
 def read_basket(cart_file, catalog):
     cart = ShoppingCart()
-    if not cart_file.exists():
-        return cart
-    with open(cart_file, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row['name']
-            quantity = float(row['quantity'])
-            product = catalog.products[name]
-            cart.add_item_quantity(product, quantity)
+    load_basket(cart_file, catalog, cart)
     return cart
 
 
+def read_teller(catalog_file, offers_file):
+    teller = Teller(read_catalog(catalog_file))
+    read_offers(offers_file, teller)
+    return teller
+
+
+def print_basket(teller, rows):
+    cart = fill_basket(rows, teller.catalog, ShoppingCart())
+    receipt = teller.checks_out_articles_from(cart)
+    # The same text print() writes for a single basket.
+    return ReceiptPrinter().print_receipt(receipt) + "\n"
+
+
+# Baskets per task sent to a worker process.
+CHUNK_SIZE = 64
+
+_worker_teller = None
+
+
+def _init_worker(catalog_file, offers_file):
+    global _worker_teller
+    _worker_teller = read_teller(catalog_file, offers_file)
+
+
+def _print_worker_baskets(chunk):
+    return "".join(print_basket(_worker_teller, rows) for rows in chunk)
+
+
+def print_baskets(baskets_file, output, catalog_file, offers_file, workers=1):
+    baskets = (rows for _, rows in iter_basket_rows(baskets_file))
+    if workers <= 1:
+        teller = read_teller(catalog_file, offers_file)
+        for rows in baskets:
+            output.write(print_basket(teller, rows))
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(catalog_file, offers_file)) as executor:
+        # Keep two chunks per worker in flight rather than submitting the
+        # whole file up front, so a large log streams in bounded memory.
+        pending = deque()
+        while chunk := list(islice(baskets, CHUNK_SIZE)):
+            if len(pending) >= 2 * workers:
+                output.write(pending.popleft().result())
+            pending.append(executor.submit(_print_worker_baskets, chunk))
+        while pending:
+            output.write(pending.popleft().result())
+
+
 def main(args):
-    catalog = read_catalog(Path("catalog.csv"))
-    teller = Teller(catalog)
-    read_offers(Path("offers.csv"), teller)
-    basket = read_basket(Path("cart.csv"), catalog)
-    receipt = teller.checks_out_articles_from(basket)
-    print(ReceiptPrinter().print_receipt(receipt))
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baskets", type=Path,
+                        help="multi-basket CSV (basket_id,name,quantity) or JSONL file")
+    parser.add_argument("--output", type=Path, help="write receipts here instead of stdout")
+    parser.add_argument("--workers", type=int, default=1)
+    options = parser.parse_args(args)
+
+    if options.baskets is None:
+        catalog = read_catalog(Path("catalog.csv"))
+        teller = Teller(catalog)
+        read_offers(Path("offers.csv"), teller)
+        basket = read_basket(Path("cart.csv"), catalog)
+        receipt = teller.checks_out_articles_from(basket)
+        print(ReceiptPrinter().print_receipt(receipt))
+        return
+
+    catalog_file, offers_file = Path("catalog.csv"), Path("offers.csv")
+    if options.output is None:
+        print_baskets(options.baskets, sys.stdout, catalog_file, offers_file, options.workers)
+    else:
+        with open(options.output, "w") as output:
+            print_baskets(options.baskets, output, catalog_file, offers_file, options.workers)
 
 
 if __name__ == "__main__":
@@ -13,3 +13,9 @@ class FakeCatalog(SupermarketCatalog):
     def unit_price(self, product):
         return self.prices[product.name]
 
+    def add_products(self, products_and_prices):
+        products = self.products
+        prices = self.prices
+        for product, price in products_and_prices:
+            products[product.name] = product
+            prices[product.name] = price
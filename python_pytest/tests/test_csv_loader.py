@@ -0,0 +1,106 @@
+import csv
+
+from csv_loader import iter_basket_rows, load_basket, load_catalog, load_offers
+from model_objects import Product, ProductUnit, SpecialOfferType
+from shopping_cart import ShoppingCart
+from teller import Teller
+from tests.fake_catalog import FakeCatalog
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def test_load_catalog_reads_every_row_in_batches(tmp_path):
+    catalog_file = write_csv(tmp_path / "catalog.csv", ["name", "unit", "price"], [
+        ["toothbrush", "EACH", "0.99"],
+        ["apples", "KILO", "1.99"],
+        ["rice", "EACH", "2.49"],
+    ])
+    catalog = FakeCatalog()
+
+    stats = load_catalog(catalog_file, catalog, batch_size=2)
+
+    assert 3 == stats.rows
+    assert ["toothbrush", "apples", "rice"] == list(catalog.products)
+    assert ProductUnit.KILO == catalog.products["apples"].unit
+    assert 2.49 == catalog.unit_price(catalog.products["rice"])
+
+
+def test_add_products_accepts_a_generator():
+    catalog = FakeCatalog()
+    names = ["toothbrush", "rice"]
+
+    catalog.add_products((Product(name, ProductUnit.EACH), float(n)) for n, name in enumerate(names))
+
+    assert names == list(catalog.products)
+    assert 1.0 == catalog.unit_price(catalog.products["rice"])
+
+
+def test_columns_are_found_by_name_and_blank_lines_skipped(tmp_path):
+    catalog_file = tmp_path / "catalog.csv"
+    catalog_file.write_text("price,name,unit\n0.99,toothbrush,EACH\n\n1.99,apples,KILO\n")
+    catalog = FakeCatalog()
+
+    stats = load_catalog(catalog_file, catalog)
+
+    assert 2 == stats.rows
+    assert 1.99 == catalog.prices["apples"]
+
+
+def test_offers_and_basket_use_the_loaded_catalog(tmp_path):
+    catalog = FakeCatalog()
+    load_catalog(write_csv(tmp_path / "catalog.csv", ["name", "unit", "price"], [
+        ["toothbrush", "EACH", "0.99"],
+    ]), catalog)
+    teller = Teller(catalog)
+    load_offers(write_csv(tmp_path / "offers.csv", ["name", "offer", "argument"], [
+        ["toothbrush", "THREE_FOR_TWO", "0"],
+    ]), teller)
+    cart = ShoppingCart()
+    load_basket(write_csv(tmp_path / "cart.csv", ["name", "quantity"], [
+        ["toothbrush", "3"],
+    ]), catalog, cart)
+
+    toothbrush = catalog.products["toothbrush"]
+    assert SpecialOfferType.THREE_FOR_TWO == teller.offers[toothbrush].offer_type
+    assert {toothbrush: 3.0} == cart.product_quantities
+
+
+def test_missing_files_load_nothing(tmp_path):
+    catalog = FakeCatalog()
+    cart = ShoppingCart()
+
+    assert 0 == load_catalog(tmp_path / "catalog.csv", catalog).rows
+    assert 0 == load_offers(tmp_path / "offers.csv", Teller(catalog)).rows
+    assert 0 == load_basket(tmp_path / "cart.csv", catalog, cart).rows
+    assert {} == catalog.products
+    assert [] == cart.items
+
+
+def test_csv_baskets_are_grouped_by_consecutive_basket_id(tmp_path):
+    baskets_file = write_csv(tmp_path / "baskets.csv", ["basket_id", "name", "quantity"], [
+        ["1", "toothbrush", "3"],
+        ["1", "apples", "1.5"],
+        ["2", "rice", "2"],
+    ])
+
+    assert [
+        ("1", [("toothbrush", 3.0), ("apples", 1.5)]),
+        ("2", [("rice", 2.0)]),
+    ] == list(iter_basket_rows(baskets_file))
+
+
+def test_jsonl_baskets_hold_one_basket_per_line(tmp_path):
+    baskets_file = tmp_path / "baskets.jsonl"
+    baskets_file.write_text(
+        '{"basket_id": "a", "items": [{"name": "toothbrush", "quantity": 3}]}\n'
+        '\n'
+        '{"basket_id": "b", "items": []}\n'
+    )
+
+    assert [("a", [("toothbrush", 3.0)]), ("b", [])] == list(iter_basket_rows(baskets_file))
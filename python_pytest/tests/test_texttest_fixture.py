@@ -0,0 +1,64 @@
+import csv
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+BASKETS = [
+    [("toothbrush", 3), ("apples", 1.5)],
+    [("rice", 2), ("toothbrush", 1)],
+    [("apples", 0.25)],
+    [("rice", 5), ("apples", 2.0), ("toothbrush", 6)],
+]
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def run_fixture(directory, *args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        str(p) for p in (ROOT / "src", ROOT / "tests", ROOT)))
+    return subprocess.run(
+        [sys.executable, str(ROOT / "src" / "texttest_fixture.py"), *args],
+        cwd=directory, env=env, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def shop(tmp_path):
+    write_csv(tmp_path / "catalog.csv", ["name", "unit", "price"], [
+        ["toothbrush", "EACH", "0.99"], ["apples", "KILO", "1.99"], ["rice", "EACH", "2.49"]])
+    write_csv(tmp_path / "offers.csv", ["name", "offer", "argument"], [
+        ["toothbrush", "THREE_FOR_TWO", "0"], ["apples", "TEN_PERCENT_DISCOUNT", "20"],
+        ["rice", "TWO_FOR_AMOUNT", "4.5"]])
+    return tmp_path
+
+
+def single_basket_receipts(shop):
+    receipts = []
+    for rows in BASKETS:
+        write_csv(shop / "cart.csv", ["name", "quantity"], rows)
+        receipts.append(run_fixture(shop))
+    return receipts
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_baskets_file_prints_what_single_baskets_print(shop, workers):
+    expected = single_basket_receipts(shop)
+    # Enough baskets for several worker chunks.
+    repeats = 30
+    write_csv(shop / "baskets.csv", ["basket_id", "name", "quantity"], [
+        [f"{n}-{i}", name, quantity]
+        for n in range(repeats) for i, rows in enumerate(BASKETS) for name, quantity in rows
+    ])
+
+    output = run_fixture(shop, "--baskets", "baskets.csv", "--workers", str(workers))
+
+    assert all("Total:" in receipt for receipt in expected)
+    assert "".join(expected) * repeats == output